@@ -25,3 +25,11 @@ def make_title_agent() -> Agent:
         instructions=_load_prompt("title_generator.yml"),
         model="gpt-4o-mini",
     )
+
+
+def make_summarizer_agent() -> Agent:
+    return Agent(
+        name="ConversationSummarizer",
+        instructions=_load_prompt("summarizer.yml"),
+        model="gpt-4o-mini",
+    )
@@ -1,9 +1,10 @@
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 from agents import Agent, Runner
+from openai.types.responses import ResponseTextDeltaEvent
 
 from domain.gateways.ai_gateway import AIGateway
-from ai.agents.agent_definitions import make_copywriter_agent, make_title_agent
+from ai.agents.agent_definitions import make_copywriter_agent, make_summarizer_agent, make_title_agent
 
 _AVAILABLE_MODELS = [
     {
@@ -37,6 +38,7 @@ class OpenAIAgentsGateway(AIGateway):
     def __init__(self):
         self._default_agent = make_copywriter_agent()
         self._title_agent = make_title_agent()
+        self._summarizer_agent = make_summarizer_agent()
 
     async def generate_response(
         self,
@@ -44,20 +46,27 @@ class OpenAIAgentsGateway(AIGateway):
         model: Optional[str] = None,
     ) -> str:
         try:
-            agent = self._default_agent
-            if model and model != "gpt-4o":
-                agent = make_copywriter_agent(model=model)
-            result = await Runner.run(agent, input=messages)
+            result = await Runner.run(self._agent_for(model), input=messages)
             return result.final_output
         except Exception as e:
-            error = str(e).lower()
-            if "authentication" in error or "api_key" in error:
-                return "❌ Erro de autenticação com a API da OpenAI. Verifique sua chave de API no arquivo .env"
-            if "quota" in error or "billing" in error:
-                return "❌ Limite de uso da API OpenAI atingido. Verifique sua conta em https://platform.openai.com/account/billing"
-            if "rate_limit" in error:
-                return "⏳ Muitas requisições. Aguarde alguns segundos e tente novamente."
-            return f"❌ Erro ao processar sua solicitação: {e}. Tente novamente."
+            return _error_message(e)
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        emitted = False
+        try:
+            result = Runner.run_streamed(self._agent_for(model), input=messages)
+            async for event in result.stream_events():
+                if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                    if event.data.delta:
+                        emitted = True
+                        yield event.data.delta
+        except Exception as e:
+            # Tokens already sent cannot be taken back, so the error is appended
+            yield ("\n\n" if emitted else "") + _error_message(e)
 
     async def generate_title(self, first_message: str) -> str:
         try:
@@ -67,5 +76,27 @@ class OpenAIAgentsGateway(AIGateway):
         except Exception:
             return "Nova Conversa"
 
+    async def summarize(self, messages: List[Dict[str, str]], previous_summary: Optional[str] = None) -> str:
+        transcript = "\n\n".join(f"[{m['role']}] {m['content']}" for m in messages)
+        prompt = f"Resumo atual:\n{previous_summary or '(vazio)'}\n\nMensagens:\n{transcript}"
+        result = await Runner.run(self._summarizer_agent, prompt)
+        return result.final_output.strip()
+
     def get_available_models(self) -> List[Dict[str, str]]:
         return _AVAILABLE_MODELS
+
+    def _agent_for(self, model: Optional[str]) -> Agent:
+        if model and model != "gpt-4o":
+            return make_copywriter_agent(model=model)
+        return self._default_agent
+
+
+def _error_message(e: Exception) -> str:
+    error = str(e).lower()
+    if "authentication" in error or "api_key" in error:
+        return "❌ Erro de autenticação com a API da OpenAI. Verifique sua chave de API no arquivo .env"
+    if "quota" in error or "billing" in error:
+        return "❌ Limite de uso da API OpenAI atingido. Verifique sua conta em https://platform.openai.com/account/billing"
+    if "rate_limit" in error:
+        return "⏳ Muitas requisições. Aguarde alguns segundos e tente novamente."
+    return f"❌ Erro ao processar sua solicitação: {e}. Tente novamente."
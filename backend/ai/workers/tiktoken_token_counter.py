@@ -0,0 +1,11 @@
+import tiktoken
+
+from domain.gateways.token_counter import TokenCounter
+
+
+class TiktokenTokenCounter(TokenCounter):
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        self._encoding = tiktoken.get_encoding(encoding_name)
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
@@ -17,3 +17,9 @@ class MessageOutput:
     role: str
     content: str
     timestamp: datetime
+
+
+@dataclass
+class StreamEventOutput:
+    event: str  # "start" | "token" | "done"
+    data: dict
@@ -34,6 +34,13 @@ class ConversationListItem:
     created_at: datetime
     updated_at: datetime
     message_count: int
+    last_message_preview: Optional[str] = None
+
+
+@dataclass
+class ConversationListPage:
+    items: List[ConversationListItem]
+    next_cursor: Optional[str] = None
 
 
 @dataclass
@@ -43,3 +50,19 @@ class DocumentOutput:
     file_size: int
     total_pages: int
     created_at: str
+
+
+@dataclass
+class IngestionJobOutput:
+    id: str
+    filename: str
+    stage: str
+    total_pages: int
+    pages_processed: int
+    total_chunks: int
+    chunks_embedded: int
+    created_at: datetime
+    updated_at: datetime
+    conversation_id: Optional[str] = None
+    document_id: Optional[str] = None
+    error: Optional[str] = None
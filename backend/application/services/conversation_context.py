@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from domain.entities.conversation import Conversation, Message
+from domain.gateways.ai_gateway import AIGateway
+from domain.gateways.token_counter import TokenCounter
+from domain.repositories.conversation_repository import ConversationRepository
+
+DEFAULT_MODEL = "gpt-4o"
+# Share of the model's max_tokens that the verbatim history may use
+HISTORY_BUDGET_RATIO = 0.5
+# When over budget, trim down to this share of the budget so folds happen in batches
+LOW_WATERMARK_RATIO = 0.75
+# The latest turns always go verbatim, even when they alone exceed the budget
+MIN_RECENT_MESSAGES = 2
+
+
+@dataclass
+class HistoryWindow:
+    messages: List[Dict[str, str]]
+    # Messages that fell out of the window and should be folded into the summary
+    to_fold: List[Message]
+    fold_until: int
+
+
+class ConversationContextManager:
+    """Keeps the prompt history of a conversation within a per-model token budget.
+
+    Recent messages go verbatim; everything older is represented by the
+    rolling summary stored on the conversation. Folding new messages into
+    the summary is a separate step so callers can run it off the hot path.
+    """
+
+    def __init__(
+        self,
+        token_counter: TokenCounter,
+        ai_gateway: AIGateway,
+        conversation_repo: ConversationRepository,
+    ):
+        self._token_counter = token_counter
+        self._ai_gateway = ai_gateway
+        self._conversation_repo = conversation_repo
+        self._budgets = {
+            m["id"]: int(m["max_tokens"] * HISTORY_BUDGET_RATIO)
+            for m in ai_gateway.get_available_models()
+        }
+        self._folding: Set[str] = set()
+
+    async def load_history(self, conversation: Conversation) -> List[Message]:
+        # The window only ever looks past the messages already folded into the summary
+        if conversation.message_count <= conversation.summarized_count:
+            return []
+        return await self._conversation_repo.find_messages(
+            conversation.id, conversation.user_id, skip=conversation.summarized_count
+        )
+
+    def count(self, text: str) -> int:
+        return self._token_counter.count(text)
+
+    def budget_for(self, model: Optional[str] = None) -> int:
+        return self._budgets.get(model or DEFAULT_MODEL, self._budgets[DEFAULT_MODEL])
+
+    def build_window(
+        self,
+        conversation: Conversation,
+        history: List[Message],
+        new_messages: List[Message],
+        model: Optional[str] = None,
+    ) -> HistoryWindow:
+        # `history` holds the stored messages after the first `summarized_count`
+        start = conversation.summarized_count
+        pending = [*history, *new_messages]
+        budget = self.budget_for(model)
+        if conversation.summary:
+            budget -= self.count(conversation.summary)
+
+        sizes = [m.token_count or self.count(m.content) for m in pending]
+        keep = len(pending)
+        if sum(sizes) > budget:
+            target = int(budget * LOW_WATERMARK_RATIO)
+            used, keep = 0, 0
+            for size in reversed(sizes):
+                if keep >= MIN_RECENT_MESSAGES and used + size > target:
+                    break
+                used += size
+                keep += 1
+
+        dropped = len(pending) - keep
+        # Only messages already persisted on the conversation may be folded
+        foldable = min(dropped, len(history))
+        messages = [{"role": m.role, "content": m.content} for m in pending[dropped:]]
+        if conversation.summary:
+            messages.insert(
+                0,
+                {"role": "system", "content": f"Resumo da conversa até aqui:\n\n{conversation.summary}"},
+            )
+        return HistoryWindow(
+            messages=messages,
+            to_fold=pending[:foldable],
+            fold_until=start + foldable,
+        )
+
+    def needs_fold(self, conversation_id: str, window: HistoryWindow) -> bool:
+        return bool(window.to_fold) and conversation_id not in self._folding
+
+    async def fold(
+        self,
+        conversation_id: str,
+        user_id: str,
+        previous_summary: Optional[str],
+        window: HistoryWindow,
+    ) -> None:
+        self._folding.add(conversation_id)
+        try:
+            summary = await self._ai_gateway.summarize(
+                [{"role": m.role, "content": m.content} for m in window.to_fold],
+                previous_summary,
+            )
+            if summary:
+                await self._conversation_repo.update_summary(
+                    conversation_id, user_id, summary, window.fold_until
+                )
+        finally:
+            self._folding.discard(conversation_id)
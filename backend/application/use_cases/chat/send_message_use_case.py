@@ -1,9 +1,13 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
 from domain.entities.conversation import Conversation, Message
 from domain.exceptions.domain_exceptions import ConversationNotFoundError
 from domain.gateways.ai_gateway import AIGateway
 from domain.gateways.rag_gateway import RAGGateway
-from domain.repositories.conversation_repository import ConversationRepository
+from domain.repositories.conversation_repository import ConversationRepository, ConversationUnitOfWork
 from application.dtos.chat_dtos import SendMessageInput, MessageOutput
+from application.services.conversation_context import ConversationContextManager
 
 
 class SendMessageUseCase:
@@ -12,80 +16,132 @@ class SendMessageUseCase:
         conversation_repo: ConversationRepository,
         ai_gateway: AIGateway,
         rag_gateway: RAGGateway,
+        context_manager: ConversationContextManager,
+        task_supervisor,
     ):
         self._conversation_repo = conversation_repo
         self._ai_gateway = ai_gateway
         self._rag_gateway = rag_gateway
+        self._context_manager = context_manager
+        self._task_supervisor = task_supervisor
 
     async def execute(self, input: SendMessageInput) -> MessageOutput:
+        conversation_id, messages, uow = await self._start_turn(input)
+        try:
+            # Generate AI response
+            ai_content = await self._ai_gateway.generate_response(messages)
+
+            return await self._finish_turn(uow, ai_content)
+        finally:
+            # A failed turn still writes a title that arrived in the meantime
+            await uow.close()
+
+    async def _start_turn(
+        self, input: SendMessageInput
+    ) -> Tuple[str, List[Dict[str, str]], ConversationUnitOfWork]:
         user_id = input.user_id
 
         if not input.conversation_id:
-            conversation = await self._conversation_repo.save(
-                Conversation(
-                    user_id=user_id,
-                    copy_type=input.copy_type or "geral",
-                    brief=input.brief,
-                )
+            # A new conversation has no documents of its own, but the general library applies
+            conversation, context = await asyncio.gather(
+                self._conversation_repo.save(
+                    Conversation(
+                        user_id=user_id,
+                        copy_type=input.copy_type or "geral",
+                        brief=input.brief,
+                    )
+                ),
+                self._search_context(input.content, user_id, None),
             )
-            is_first = True
         else:
-            conversation = await self._conversation_repo.find_by_id(
-                input.conversation_id, user_id
+            # Loading the conversation and RAG retrieval only depend on the input
+            conversation, context = await asyncio.gather(
+                self._conversation_repo.find_by_id(input.conversation_id, user_id),
+                self._search_context(input.content, user_id, input.conversation_id),
             )
             if not conversation:
                 raise ConversationNotFoundError("Conversa não encontrada")
-            if input.brief:
-                await self._conversation_repo.update_brief(
-                    input.conversation_id, user_id, input.brief
-                )
-            is_first = len(conversation.messages) == 0
 
         conversation_id = conversation.id
+        is_first = conversation.message_count == 0
+        history = await self._context_manager.load_history(conversation)
 
-        # Save user message
-        user_msg = Message(role="user", content=input.content)
-        conversation = await self._conversation_repo.add_message(
-            conversation_id, user_id, user_msg
+        # The turn's writes go through one unit of work, flushed before the model call
+        # (so the user's message is stored even if generation fails) and at the end
+        uow = self._conversation_repo.unit_of_work(conversation_id, user_id)
+        user_msg = Message(
+            role="user",
+            content=input.content,
+            token_count=self._context_manager.count(input.content),
         )
+        uow.add_message(user_msg)
+        if input.conversation_id and input.brief:
+            uow.set_brief(input.brief)
+        if not await uow.flush():
+            raise ConversationNotFoundError("Conversa não encontrada")
 
-        # Generate title on first message (fire-and-forget, don't block)
+        # Title generation is off the critical path
         if is_first:
-            title = await self._ai_gateway.generate_title(input.content)
-            await self._conversation_repo.update_title(conversation_id, user_id, title)
+            self._task_supervisor.spawn(
+                self._generate_title(conversation_id, user_id, input.content, uow),
+                name=f"title:{conversation_id}",
+            )
 
-        # Build message history for AI
-        messages = [
-            {"role": m.role, "content": m.content} for m in conversation.messages
-        ]
+        # Build message history for AI within the token budget
+        window = self._context_manager.build_window(conversation, history, [user_msg])
+        messages = window.messages
+        if self._context_manager.needs_fold(conversation_id, window):
+            self._task_supervisor.spawn(
+                self._context_manager.fold(conversation_id, user_id, conversation.summary, window),
+                name=f"summary:{conversation_id}",
+            )
 
         # Inject RAG context if available
-        try:
-            collection = f"user_{user_id}_{conversation_id}"
-            context = await self._rag_gateway.search_similar(input.content, collection)
-            if context:
-                messages.insert(
-                    0,
-                    {
-                        "role": "system",
-                        "content": f"Use o seguinte contexto dos documentos para responder:\n\n{context}",
-                    },
-                )
-        except Exception:
-            pass
+        if context:
+            messages.insert(
+                0,
+                {
+                    "role": "system",
+                    "content": f"Use o seguinte contexto dos documentos para responder:\n\n{context}",
+                },
+            )
 
-        # Generate AI response
-        ai_content = await self._ai_gateway.generate_response(messages)
+        return conversation_id, messages, uow
 
-        # Save assistant message
-        ai_msg = Message(role="assistant", content=ai_content)
-        conversation = await self._conversation_repo.add_message(
-            conversation_id, user_id, ai_msg
+    async def _finish_turn(self, uow: ConversationUnitOfWork, ai_content: str) -> MessageOutput:
+        # Save assistant message, together with the title if it is ready by now
+        ai_msg = Message(
+            role="assistant",
+            content=ai_content,
+            token_count=self._context_manager.count(ai_content),
         )
+        uow.add_message(ai_msg)
+        if not await uow.close():
+            raise ConversationNotFoundError("Conversa não encontrada")
 
-        last_msg = conversation.messages[-1]
         return MessageOutput(
-            role=last_msg.role,
-            content=last_msg.content,
-            timestamp=last_msg.timestamp,
+            role=ai_msg.role,
+            content=ai_msg.content,
+            timestamp=ai_msg.timestamp,
         )
+
+    async def _search_context(self, query: str, user_id: str, conversation_id: Optional[str]) -> str:
+        # Most conversations never get a PDF; skip the query embedding for them.
+        # PDFs uploaded without a conversation form the user's general library, searched too.
+        if not (
+            self._rag_gateway.has_documents(user_id, conversation_id)
+            or self._rag_gateway.has_documents(user_id)
+        ):
+            return ""
+        try:
+            return await self._rag_gateway.search_similar(query, user_id, conversation_id)
+        except Exception:
+            return ""
+
+    async def _generate_title(
+        self, conversation_id: str, user_id: str, first_message: str, uow: ConversationUnitOfWork
+    ) -> None:
+        title = await self._ai_gateway.generate_title(first_message)
+        # Ride along with the turn's final flush when it has not happened yet
+        if not uow.set_title(title):
+            await self._conversation_repo.update_title(conversation_id, user_id, title)
@@ -0,0 +1,36 @@
+from typing import AsyncIterator
+
+from application.dtos.chat_dtos import SendMessageInput, StreamEventOutput
+from application.use_cases.chat.send_message_use_case import SendMessageUseCase
+
+
+class StreamMessageUseCase(SendMessageUseCase):
+    """Same turn as SendMessageUseCase, but yields the reply token by token.
+
+    Events: ``start`` (conversation id), ``token`` (text delta) and ``done``
+    (the persisted assistant message). The assistant message is saved only
+    once the model stream has finished.
+    """
+
+    async def execute(self, input: SendMessageInput) -> AsyncIterator[StreamEventOutput]:
+        conversation_id, messages, uow = await self._start_turn(input)
+        try:
+            yield StreamEventOutput(event="start", data={"conversation_id": conversation_id})
+
+            parts = []
+            async for delta in self._ai_gateway.stream_response(messages):
+                parts.append(delta)
+                yield StreamEventOutput(event="token", data={"delta": delta})
+
+            result = await self._finish_turn(uow, "".join(parts))
+        finally:
+            await uow.close()
+        yield StreamEventOutput(
+            event="done",
+            data={
+                "conversation_id": conversation_id,
+                "role": result.role,
+                "content": result.content,
+                "timestamp": result.timestamp.isoformat(),
+            },
+        )
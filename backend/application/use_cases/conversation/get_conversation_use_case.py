@@ -12,6 +12,7 @@ class GetConversationUseCase:
         conversation = await self._repo.find_by_id(conversation_id, user_id)
         if not conversation:
             raise ConversationNotFoundError("Conversa não encontrada")
+        messages = await self._repo.find_messages(conversation_id, user_id)
 
         return ConversationOutput(
             id=conversation.id,
@@ -20,7 +21,7 @@ class GetConversationUseCase:
             copy_type=conversation.copy_type,
             messages=[
                 MessageOutput(role=m.role, content=m.content, timestamp=m.timestamp)
-                for m in conversation.messages
+                for m in messages
             ],
             brief=conversation.brief,
             created_at=conversation.created_at,
@@ -1,23 +1,73 @@
-from typing import List
+import base64
+import re
+from datetime import datetime
+from typing import Optional, Tuple
 
+from domain.exceptions.domain_exceptions import InvalidCursorError
 from domain.repositories.conversation_repository import ConversationRepository
-from application.dtos.conversation_dtos import ConversationListItem
+from application.dtos.conversation_dtos import ConversationListItem, ConversationListPage
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+_CONVERSATION_ID = re.compile(r"^[0-9a-f]{24}$")
+
+
+def _encode_cursor(updated_at: datetime, conversation_id: str) -> str:
+    raw = f"{updated_at.isoformat()}|{conversation_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        updated_at, conversation_id = raw.split("|", 1)
+        if not _CONVERSATION_ID.match(conversation_id):
+            raise ValueError(conversation_id)
+        return datetime.fromisoformat(updated_at), conversation_id
+    except ValueError:
+        raise InvalidCursorError("Cursor inválido")
 
 
 class ListConversationsUseCase:
     def __init__(self, conversation_repo: ConversationRepository):
         self._repo = conversation_repo
 
-    async def execute(self, user_id: str, include_archived: bool = False) -> List[ConversationListItem]:
-        conversations = await self._repo.find_by_user(user_id, include_archived)
-        return [
-            ConversationListItem(
-                id=conv.id,
-                title=conv.title,
-                copy_type=conv.copy_type,
-                created_at=conv.created_at,
-                updated_at=conv.updated_at,
-                message_count=len(conv.messages),
-            )
-            for conv in conversations
-        ]
+    async def execute(
+        self,
+        user_id: str,
+        include_archived: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> ConversationListPage:
+        if limit is None and cursor is None:
+            # Clients that do not paginate still get every conversation
+            conversations = await self._repo.find_by_user(user_id, include_archived)
+            has_more = False
+        else:
+            limit = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+            after = _decode_cursor(cursor) if cursor else None
+            # One extra row tells whether there is a next page
+            conversations = await self._repo.find_by_user(user_id, include_archived, limit + 1, after)
+            has_more = len(conversations) > limit
+            conversations = conversations[:limit]
+
+        next_cursor = None
+        if has_more:
+            last = conversations[-1]
+            next_cursor = _encode_cursor(last.updated_at, last.id)
+
+        return ConversationListPage(
+            items=[
+                ConversationListItem(
+                    id=conv.id,
+                    title=conv.title,
+                    copy_type=conv.copy_type,
+                    created_at=conv.created_at,
+                    updated_at=conv.updated_at,
+                    message_count=conv.message_count,
+                    last_message_preview=conv.last_message_preview,
+                )
+                for conv in conversations
+            ],
+            next_cursor=next_cursor,
+        )
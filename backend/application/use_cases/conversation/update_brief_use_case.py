@@ -1,3 +1,5 @@
+import asyncio
+
 from domain.exceptions.domain_exceptions import ConversationNotFoundError
 from domain.repositories.conversation_repository import ConversationRepository
 from application.dtos.chat_dtos import MessageOutput
@@ -13,7 +15,10 @@ class UpdateBriefUseCase:
         if not conversation:
             raise ConversationNotFoundError("Conversa não encontrada")
 
-        conversation = await self._repo.update_brief(conversation_id, user_id, brief)
+        conversation, messages = await asyncio.gather(
+            self._repo.update_brief(conversation_id, user_id, brief),
+            self._repo.find_messages(conversation_id, user_id),
+        )
 
         return ConversationOutput(
             id=conversation.id,
@@ -22,7 +27,7 @@ class UpdateBriefUseCase:
             copy_type=conversation.copy_type,
             messages=[
                 MessageOutput(role=m.role, content=m.content, timestamp=m.timestamp)
-                for m in conversation.messages
+                for m in messages
             ],
             brief=conversation.brief,
             created_at=conversation.created_at,
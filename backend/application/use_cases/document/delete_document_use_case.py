@@ -14,5 +14,10 @@ class DeleteDocumentUseCase:
             raise DocumentNotFoundError("Documento não encontrado")
 
         self._rag_gateway.delete_file(document.file_path)
-        self._rag_gateway.delete_collection(document.collection_name)
+        await self._rag_gateway.delete_document(
+            document.collection_name,
+            document.id,
+            document.file_path,
+            document.conversation_id,
+        )
         await self._document_repo.delete(document_id, user_id)
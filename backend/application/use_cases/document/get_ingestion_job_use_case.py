@@ -0,0 +1,27 @@
+from domain.exceptions.domain_exceptions import IngestionJobNotFoundError
+from domain.repositories.ingestion_job_repository import IngestionJobRepository
+from application.dtos.conversation_dtos import IngestionJobOutput
+
+
+class GetIngestionJobUseCase:
+    def __init__(self, job_repo: IngestionJobRepository):
+        self._repo = job_repo
+
+    async def execute(self, job_id: str, user_id: str) -> IngestionJobOutput:
+        job = await self._repo.find_by_id(job_id, user_id)
+        if not job:
+            raise IngestionJobNotFoundError("Processamento não encontrado")
+        return IngestionJobOutput(
+            id=job.id,
+            filename=job.filename,
+            stage=job.stage,
+            total_pages=job.total_pages,
+            pages_processed=job.pages_processed,
+            total_chunks=job.total_chunks,
+            chunks_embedded=job.chunks_embedded,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+            conversation_id=job.conversation_id,
+            document_id=job.document_id,
+            error=job.error,
+        )
@@ -0,0 +1,62 @@
+import asyncio
+
+from domain.entities.document import Document
+from domain.entities.ingestion_job import IngestionJob
+from domain.gateways.rag_gateway import RAGGateway
+from domain.repositories.document_repository import DocumentRepository
+from domain.repositories.ingestion_job_repository import IngestionJobRepository
+
+
+class ProcessDocumentUseCase:
+    """Runs a queued upload through the RAG pipeline, recording progress on the job."""
+
+    def __init__(
+        self,
+        document_repo: DocumentRepository,
+        job_repo: IngestionJobRepository,
+        rag_gateway: RAGGateway,
+    ):
+        self._document_repo = document_repo
+        self._job_repo = job_repo
+        self._rag_gateway = rag_gateway
+
+    async def execute(self, job: IngestionJob) -> None:
+        async def progress(**fields) -> None:
+            await self._job_repo.update(job.id, fields)
+
+        # The id is reserved up front so every vector can be tagged with it
+        document_id = self._document_repo.next_id()
+        try:
+            result = await self._rag_gateway.process_pdf(
+                pdf_path=job.pdf_path,
+                filename=job.filename,
+                user_id=job.user_id,
+                document_id=document_id,
+                conversation_id=job.conversation_id,
+                content_hash=job.content_hash,
+                progress=progress,
+            )
+            document = await self._document_repo.save(
+                Document(
+                    id=document_id,
+                    user_id=job.user_id,
+                    conversation_id=job.conversation_id,
+                    filename=job.filename,
+                    file_path=result["file_path"],
+                    file_size=job.file_size,
+                    content_hash=result["content_hash"],
+                    collection_name=result["collection_name"],
+                    total_pages=result["total_pages"],
+                )
+            )
+        except asyncio.CancelledError:
+            # Shutdown mid-job; the gateway has already undone its partial writes
+            await self._job_repo.update(
+                job.id, {"stage": "failed", "error": "Processamento interrompido. Envie o arquivo novamente."}
+            )
+            raise
+        except Exception as e:
+            await self._job_repo.update(job.id, {"stage": "failed", "error": str(e)})
+            raise
+
+        await self._job_repo.update(job.id, {"stage": "completed", "document_id": document.id})
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from domain.repositories.ingestion_job_repository import IngestionJobRepository
+
+
+class ResumeIngestionJobsUseCase:
+    """Run at startup: the ingestion queue lives in memory, so jobs left unfinished
+    by the previous process are queued again or marked as failed."""
+
+    def __init__(self, job_repo: IngestionJobRepository, ingestion_queue):
+        self._job_repo = job_repo
+        self._ingestion_queue = ingestion_queue
+
+    async def execute(self) -> int:
+        requeued = 0
+        for job in await self._job_repo.find_unfinished():
+            spooled = Path(job.pdf_path) if job.pdf_path else None
+            if job.stage == "queued" and spooled and spooled.exists():
+                await self._ingestion_queue.put(job)
+                requeued += 1
+                continue
+            # Interrupted mid-processing (or queued before the path was recorded): nothing to resume from
+            await self._job_repo.update(
+                job.id, {"stage": "failed", "error": "Processamento interrompido. Envie o arquivo novamente."}
+            )
+            if spooled:
+                spooled.unlink(missing_ok=True)
+        return requeued
@@ -1,40 +1,46 @@
 from typing import Optional
 
-from domain.entities.document import Document
-from domain.gateways.rag_gateway import RAGGateway
-from domain.repositories.document_repository import DocumentRepository
-from application.dtos.conversation_dtos import DocumentOutput
+from domain.entities.ingestion_job import IngestionJob
+from domain.repositories.ingestion_job_repository import IngestionJobRepository
+from application.dtos.conversation_dtos import IngestionJobOutput
 
 
 class UploadDocumentUseCase:
-    def __init__(self, document_repo: DocumentRepository, rag_gateway: RAGGateway):
-        self._document_repo = document_repo
-        self._rag_gateway = rag_gateway
+    def __init__(self, job_repo: IngestionJobRepository, ingestion_queue):
+        self._job_repo = job_repo
+        self._ingestion_queue = ingestion_queue
 
     async def execute(
         self,
-        pdf_bytes: bytes,
+        pdf_path: str,
         filename: str,
         file_size: int,
+        content_hash: str,
         user_id: str,
         conversation_id: Optional[str] = None,
-    ) -> dict:
-        result = await self._rag_gateway.process_pdf(
-            pdf_bytes=pdf_bytes,
-            filename=filename,
-            user_id=user_id,
-            conversation_id=conversation_id,
+    ) -> IngestionJobOutput:
+        job = await self._job_repo.save(
+            IngestionJob(
+                user_id=user_id,
+                conversation_id=conversation_id,
+                filename=filename,
+                file_size=file_size,
+                content_hash=content_hash,
+                pdf_path=pdf_path,
+            )
         )
-
-        document = Document(
-            user_id=user_id,
-            conversation_id=conversation_id,
-            filename=filename,
-            file_path=result["file_path"],
-            file_size=file_size,
-            collection_name=result["collection_name"],
-            total_pages=result["total_pages"],
+        await self._ingestion_queue.put(job)
+        return IngestionJobOutput(
+            id=job.id,
+            filename=job.filename,
+            stage=job.stage,
+            total_pages=job.total_pages,
+            pages_processed=job.pages_processed,
+            total_chunks=job.total_chunks,
+            chunks_embedded=job.chunks_embedded,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+            conversation_id=job.conversation_id,
+            document_id=job.document_id,
+            error=job.error,
         )
-        document = await self._document_repo.save(document)
-
-        return {**result, "document_id": document.id, "status": "success"}
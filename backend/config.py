@@ -13,6 +13,27 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str
     
+    # RAG
+    max_upload_mb: int = 10
+    rag_max_workers: int = 4
+    ingestion_workers: int = 2
+    pdf_extraction_workers: int = 2
+    pdf_pages_per_batch: int = 8
+    embedding_cache_max_entries: int = 200_000
+    embedding_provider: str = "openai"  # "openai" | "onnx" | "sentence-transformers" | "hashing"
+    embedding_model: str = "text-embedding-ada-002"
+    local_embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_batch_tokens: int = 20_000
+    embedding_concurrency: int = 4
+    rag_lexical_shortcut_coverage: float = 0.9
+    rag_context_max_tokens: int = 1200
+    rag_min_similarity: float = 0.75
+    rag_mmr_lambda: float = 0.7
+    rag_result_cache_size: int = 1024
+    rag_result_cache_ttl_seconds: int = 600
+    query_embedding_cache_mb: int = 32
+    rag_collection_layout: str = "per_user"  # "per_user" | "per_conversation"
+
     # CORS
     frontend_url: str = "http://localhost:5173"
     
@@ -9,9 +9,11 @@ from pathlib import Path
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from application.services.conversation_context import ConversationContextManager
 from application.use_cases.auth.login_use_case import LoginUseCase
 from application.use_cases.auth.signup_use_case import SignupUseCase
 from application.use_cases.chat.send_message_use_case import SendMessageUseCase
+from application.use_cases.chat.stream_message_use_case import StreamMessageUseCase
 from application.use_cases.conversation.archive_conversation_use_case import ArchiveConversationUseCase
 from application.use_cases.conversation.create_conversation_use_case import CreateConversationUseCase
 from application.use_cases.conversation.delete_conversation_use_case import DeleteConversationUseCase
@@ -19,36 +21,64 @@ from application.use_cases.conversation.get_conversation_use_case import GetConv
 from application.use_cases.conversation.list_conversations_use_case import ListConversationsUseCase
 from application.use_cases.conversation.update_brief_use_case import UpdateBriefUseCase
 from application.use_cases.document.delete_document_use_case import DeleteDocumentUseCase
+from application.use_cases.document.get_ingestion_job_use_case import GetIngestionJobUseCase
 from application.use_cases.document.list_documents_use_case import ListDocumentsUseCase
+from application.use_cases.document.process_document_use_case import ProcessDocumentUseCase
+from application.use_cases.document.resume_ingestion_jobs_use_case import ResumeIngestionJobsUseCase
 from application.use_cases.document.upload_document_use_case import UploadDocumentUseCase
 from ai.workers.openai_agents_gateway import OpenAIAgentsGateway
+from ai.workers.tiktoken_token_counter import TiktokenTokenCounter
 from infrastructure.auth.jwt_token_service import JWTTokenService
 from infrastructure.auth.password_service import PasswordService
 from infrastructure.database.repositories.mongo_conversation_repository import MongoConversationRepository
 from infrastructure.database.repositories.mongo_document_repository import MongoDocumentRepository
+from infrastructure.database.repositories.mongo_ingestion_job_repository import MongoIngestionJobRepository
 from infrastructure.database.repositories.mongo_user_repository import MongoUserRepository
 from infrastructure.rag.chromadb_rag_gateway import ChromaDBRAGGateway
+from infrastructure.tasks.ingestion_queue import IngestionQueue
+from infrastructure.tasks.task_supervisor import TaskSupervisor
 
 
 class Container:
     """Holds all wired-up dependencies for the application."""
 
-    def __init__(self, db: AsyncIOMotorDatabase, openai_api_key: str, jwt_settings: dict):
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        openai_api_key: str,
+        jwt_settings: dict,
+        rag_settings: dict,
+        ingestion_workers: int = 2,
+        max_upload_mb: int = 10,
+    ):
         # --- Infrastructure ---
         self.password_service = PasswordService()
         self.token_service = JWTTokenService(**jwt_settings)
 
         storage_dir = str(Path(__file__).parent / "storage")
+        self.upload_dir = str(Path(storage_dir) / "uploads")
+        self.max_upload_bytes = max_upload_mb * 1024 * 1024
+        self.token_counter = TiktokenTokenCounter()
         self.rag_gateway = ChromaDBRAGGateway(
             openai_api_key=openai_api_key,
             base_storage_dir=storage_dir,
+            token_counter=self.token_counter,
+            **rag_settings,
         )
         self.ai_gateway = OpenAIAgentsGateway()
+        self.task_supervisor = TaskSupervisor()
+        self.ingestion_queue = IngestionQueue(workers=ingestion_workers)
 
         # --- Repositories ---
         self.user_repo = MongoUserRepository(db)
         self.conversation_repo = MongoConversationRepository(db)
         self.document_repo = MongoDocumentRepository(db)
+        self.ingestion_job_repo = MongoIngestionJobRepository(db)
+
+        # --- Application services ---
+        self.context_manager = ConversationContextManager(
+            self.token_counter, self.ai_gateway, self.conversation_repo
+        )
 
         # --- Use Cases: Auth ---
         self.signup_use_case = SignupUseCase(self.user_repo, self.password_service)
@@ -56,7 +86,18 @@ class Container:
 
         # --- Use Cases: Chat ---
         self.send_message_use_case = SendMessageUseCase(
-            self.conversation_repo, self.ai_gateway, self.rag_gateway
+            self.conversation_repo,
+            self.ai_gateway,
+            self.rag_gateway,
+            self.context_manager,
+            self.task_supervisor,
+        )
+        self.stream_message_use_case = StreamMessageUseCase(
+            self.conversation_repo,
+            self.ai_gateway,
+            self.rag_gateway,
+            self.context_manager,
+            self.task_supervisor,
         )
 
         # --- Use Cases: Conversation ---
@@ -68,18 +109,42 @@ class Container:
         self.update_brief_use_case = UpdateBriefUseCase(self.conversation_repo)
 
         # --- Use Cases: Document ---
-        self.upload_document_use_case = UploadDocumentUseCase(self.document_repo, self.rag_gateway)
+        self.upload_document_use_case = UploadDocumentUseCase(
+            self.ingestion_job_repo, self.ingestion_queue
+        )
+        self.process_document_use_case = ProcessDocumentUseCase(
+            self.document_repo, self.ingestion_job_repo, self.rag_gateway
+        )
+        self.get_ingestion_job_use_case = GetIngestionJobUseCase(self.ingestion_job_repo)
         self.list_documents_use_case = ListDocumentsUseCase(self.document_repo)
         self.delete_document_use_case = DeleteDocumentUseCase(self.document_repo, self.rag_gateway)
+        self.resume_ingestion_jobs_use_case = ResumeIngestionJobsUseCase(
+            self.ingestion_job_repo, self.ingestion_queue
+        )
+        self.ingestion_queue.set_handler(self.process_document_use_case.execute)
 
 
 # Single global container instance, set during app startup
 _container: Container = None
 
 
-def init_container(db: AsyncIOMotorDatabase, openai_api_key: str, jwt_settings: dict) -> Container:
+def init_container(
+    db: AsyncIOMotorDatabase,
+    openai_api_key: str,
+    jwt_settings: dict,
+    rag_settings: dict,
+    ingestion_workers: int = 2,
+    max_upload_mb: int = 10,
+) -> Container:
     global _container
-    _container = Container(db=db, openai_api_key=openai_api_key, jwt_settings=jwt_settings)
+    _container = Container(
+        db=db,
+        openai_api_key=openai_api_key,
+        jwt_settings=jwt_settings,
+        rag_settings=rag_settings,
+        ingestion_workers=ingestion_workers,
+        max_upload_mb=max_upload_mb,
+    )
     return _container
 
 
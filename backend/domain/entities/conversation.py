@@ -1,12 +1,13 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 
 
 @dataclass
 class Message:
     role: str  # "user" | "assistant"
     content: str
+    token_count: int = 0
     timestamp: datetime = field(default_factory=datetime.utcnow)
 
 
@@ -15,8 +16,11 @@ class Conversation:
     user_id: str
     title: str = "Nova Conversa"
     copy_type: str = "geral"
-    messages: List[Message] = field(default_factory=list)
+    message_count: int = 0
+    last_message_preview: Optional[str] = None
     brief: Optional[dict] = None
+    summary: Optional[str] = None
+    summarized_count: int = 0  # leading messages already folded into `summary`
     is_archived: bool = False
     id: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
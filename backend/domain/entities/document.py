@@ -12,6 +12,7 @@ class Document:
     collection_name: str
     total_pages: int = 0
     conversation_id: Optional[str] = None
+    content_hash: Optional[str] = None  # SHA-256 of the PDF; file_path points at the shared blob
     mime_type: str = "application/pdf"
     id: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class IngestionJob:
+    user_id: str
+    filename: str
+    file_size: int
+    conversation_id: Optional[str] = None
+    content_hash: Optional[str] = None
+    pdf_path: Optional[str] = None  # Spooled upload, until the blob store takes it over
+    stage: str = "queued"  # "queued" | "extracting" | "chunking" | "embedding" | "completed" | "failed"
+    total_pages: int = 0
+    pages_processed: int = 0
+    total_chunks: int = 0
+    chunks_embedded: int = 0
+    document_id: Optional[str] = None
+    error: Optional[str] = None
+    id: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
@@ -24,3 +24,11 @@ class ConversationNotFoundError(DomainException):
 
 class DocumentNotFoundError(DomainException):
     pass
+
+
+class IngestionJobNotFoundError(DomainException):
+    pass
+
+
+class InvalidCursorError(DomainException):
+    pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 
 class AIGateway(ABC):
@@ -10,8 +10,22 @@ class AIGateway(ABC):
         model: Optional[str] = None,
     ) -> str: ...
 
+    @abstractmethod
+    def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]: ...
+
     @abstractmethod
     async def generate_title(self, first_message: str) -> str: ...
 
+    @abstractmethod
+    async def summarize(
+        self,
+        messages: List[Dict[str, str]],
+        previous_summary: Optional[str] = None,
+    ) -> str: ...
+
     @abstractmethod
     def get_available_models(self) -> List[Dict[str, str]]: ...
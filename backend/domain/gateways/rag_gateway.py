@@ -1,25 +1,44 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 
 class RAGGateway(ABC):
     @abstractmethod
     async def process_pdf(
         self,
-        pdf_bytes: bytes,
+        pdf_path: str,
         filename: str,
         user_id: str,
+        document_id: str,
         conversation_id: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        progress: Optional[Callable[..., Awaitable[None]]] = None,
     ) -> dict: ...
 
+    @abstractmethod
+    def collection_for(self, user_id: str, conversation_id: Optional[str] = None) -> str: ...
+
+    @abstractmethod
+    def has_documents(self, user_id: str, conversation_id: Optional[str] = None) -> bool: ...
+
     @abstractmethod
     async def search_similar(
         self,
         query: str,
-        collection_name: str,
-        k: int = 3,
+        user_id: str,
+        conversation_id: Optional[str] = None,
+        k: int = 6,
     ) -> str: ...
 
+    @abstractmethod
+    async def delete_document(
+        self,
+        collection_name: str,
+        document_id: str,
+        file_path: str,
+        conversation_id: Optional[str] = None,
+    ) -> None: ...
+
     @abstractmethod
     def delete_collection(self, collection_name: str) -> None: ...
 
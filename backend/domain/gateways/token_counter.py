@@ -0,0 +1,6 @@
+from abc import ABC, abstractmethod
+
+
+class TokenCounter(ABC):
+    @abstractmethod
+    def count(self, text: str) -> int: ...
@@ -1,21 +1,57 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from domain.entities.conversation import Conversation, Message
 
 
+class ConversationUnitOfWork(ABC):
+    """Collects the writes of one chat turn and applies them together on flush()."""
+
+    @abstractmethod
+    def add_message(self, message: Message) -> None: ...
+
+    @abstractmethod
+    def set_brief(self, brief: dict) -> None: ...
+
+    # False once the unit of work is closed; the caller must then write the title itself
+    @abstractmethod
+    def set_title(self, title: str) -> bool: ...
+
+    # False when the conversation no longer exists
+    @abstractmethod
+    async def flush(self) -> bool: ...
+
+    # Flushes what is pending and refuses further changes; safe to call more than once
+    @abstractmethod
+    async def close(self) -> bool: ...
+
+
 class ConversationRepository(ABC):
     @abstractmethod
     async def find_by_id(self, conversation_id: str, user_id: str) -> Optional[Conversation]: ...
 
     @abstractmethod
-    async def find_by_user(self, user_id: str, include_archived: bool = False) -> List[Conversation]: ...
+    async def find_messages(
+        self, conversation_id: str, user_id: str, skip: int = 0, limit: Optional[int] = None
+    ) -> List[Message]: ...
+
+    # Most recently updated first, without messages or brief; `after` is the
+    # (updated_at, id) of the last conversation of the previous page
+    @abstractmethod
+    async def find_by_user(
+        self,
+        user_id: str,
+        include_archived: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+    ) -> List[Conversation]: ...
 
     @abstractmethod
     async def save(self, conversation: Conversation) -> Conversation: ...
 
     @abstractmethod
-    async def add_message(self, conversation_id: str, user_id: str, message: Message) -> Conversation: ...
+    def unit_of_work(self, conversation_id: str, user_id: str) -> ConversationUnitOfWork: ...
 
     @abstractmethod
     async def update_title(self, conversation_id: str, user_id: str, title: str) -> None: ...
@@ -23,6 +59,11 @@ class ConversationRepository(ABC):
     @abstractmethod
     async def update_brief(self, conversation_id: str, user_id: str, brief: dict) -> Conversation: ...
 
+    @abstractmethod
+    async def update_summary(
+        self, conversation_id: str, user_id: str, summary: str, summarized_count: int
+    ) -> None: ...
+
     @abstractmethod
     async def delete(self, conversation_id: str, user_id: str) -> None: ...
 
@@ -5,6 +5,9 @@ from domain.entities.document import Document
 
 
 class DocumentRepository(ABC):
+    @abstractmethod
+    def next_id(self) -> str: ...
+
     @abstractmethod
     async def find_by_id(self, document_id: str, user_id: str) -> Optional[Document]: ...
 
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from domain.entities.ingestion_job import IngestionJob
+
+
+class IngestionJobRepository(ABC):
+    @abstractmethod
+    async def find_by_id(self, job_id: str, user_id: str) -> Optional[IngestionJob]: ...
+
+    @abstractmethod
+    async def save(self, job: IngestionJob) -> IngestionJob: ...
+
+    @abstractmethod
+    async def update(self, job_id: str, fields: dict) -> None: ...
+
+    @abstractmethod
+    async def find_unfinished(self) -> List[IngestionJob]: ...
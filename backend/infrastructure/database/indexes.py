@@ -0,0 +1,40 @@
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from infrastructure.database.repositories.mongo_conversation_repository import MongoConversationRepository
+from infrastructure.database.repositories.mongo_document_repository import MongoDocumentRepository
+from infrastructure.database.repositories.mongo_ingestion_job_repository import MongoIngestionJobRepository
+from infrastructure.database.repositories.mongo_user_repository import MongoUserRepository
+
+# Each repository declares the indexes its queries need in INDEXES
+_REPOSITORIES = [
+    MongoUserRepository,
+    MongoConversationRepository,
+    MongoDocumentRepository,
+    MongoIngestionJobRepository,
+]
+
+
+def index_registry() -> Dict[str, List[IndexModel]]:
+    registry: Dict[str, List[IndexModel]] = {}
+    for repository in _REPOSITORIES:
+        for collection, indexes in repository.INDEXES.items():
+            registry.setdefault(collection, []).extend(indexes)
+    return registry
+
+
+def index_name(index: IndexModel) -> str:
+    return index.document["name"]
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    # createIndexes is a no-op for indexes that already exist with the same spec
+    for collection, indexes in index_registry().items():
+        try:
+            await db[collection].create_indexes(indexes)
+        except OperationFailure as e:
+            # e.g. duplicate emails blocking a unique index; the API still starts
+            print(f"Erro ao criar índices em {collection}: {e}")
@@ -1,39 +1,99 @@
+import asyncio
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from domain.entities.conversation import Conversation, Message
-from domain.repositories.conversation_repository import ConversationRepository
+from domain.repositories.conversation_repository import ConversationRepository, ConversationUnitOfWork
+
+
+# Messages live in their own collection; conversation documents never carry the history
+_WITHOUT_MESSAGES = {"messages": 0}
+_MESSAGE_ORDER = [("timestamp", ASCENDING), ("_id", ASCENDING)]
+# The sidebar only needs these
+_LIST_FIELDS = {
+    "user_id": 1,
+    "title": 1,
+    "copy_type": 1,
+    "message_count": 1,
+    "last_message_preview": 1,
+    "is_archived": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+_LIST_ORDER = [("updated_at", DESCENDING), ("_id", DESCENDING)]
+_PREVIEW_CHARS = 120
 
 
 class MongoConversationRepository(ConversationRepository):
+    INDEXES = {
+        "conversations": [
+            # Sidebar pages, without and with archived conversations
+            IndexModel([("user_id", ASCENDING), ("is_archived", ASCENDING), *_LIST_ORDER]),
+            IndexModel([("user_id", ASCENDING), *_LIST_ORDER]),
+        ],
+        "messages": [
+            # Covers find_messages' sort too, so history reads walk the index in order
+            IndexModel([("conversation_id", ASCENDING), *_MESSAGE_ORDER]),
+        ],
+    }
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self._col = db.conversations
+        self._messages = db.messages
 
     async def find_by_id(self, conversation_id: str, user_id: str) -> Optional[Conversation]:
         data = await self._col.find_one(
-            {"_id": ObjectId(conversation_id), "user_id": user_id}
+            {"_id": ObjectId(conversation_id), "user_id": user_id}, _WITHOUT_MESSAGES
         )
         return self._to_entity(data) if data else None
 
-    async def find_by_user(self, user_id: str, include_archived: bool = False) -> List[Conversation]:
+    async def find_messages(
+        self, conversation_id: str, user_id: str, skip: int = 0, limit: Optional[int] = None
+    ) -> List[Message]:
+        cursor = (
+            self._messages.find({"conversation_id": conversation_id, "user_id": user_id})
+            .sort(_MESSAGE_ORDER)
+            .skip(skip)
+        )
+        if limit:
+            cursor = cursor.limit(limit)
+        return [self._to_message(data) async for data in cursor]
+
+    async def find_by_user(
+        self,
+        user_id: str,
+        include_archived: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+    ) -> List[Conversation]:
         query = {"user_id": user_id}
         if not include_archived:
             query["is_archived"] = False
-        conversations = []
-        async for data in self._col.find(query).sort("updated_at", -1):
-            conversations.append(self._to_entity(data))
-        return conversations
+        if after:
+            # Keyset pagination: strictly after the last (updated_at, _id) already returned
+            updated_at, last_id = after
+            query["$or"] = [
+                {"updated_at": {"$lt": updated_at}},
+                {"updated_at": updated_at, "_id": {"$lt": ObjectId(last_id)}},
+            ]
+        cursor = self._col.find(query, _LIST_FIELDS).sort(_LIST_ORDER)
+        if limit:
+            cursor = cursor.limit(limit)
+        return [self._to_entity(data) async for data in cursor]
 
     async def save(self, conversation: Conversation) -> Conversation:
         doc = {
             "user_id": conversation.user_id,
             "title": conversation.title,
             "copy_type": conversation.copy_type,
-            "messages": [],
+            "message_count": conversation.message_count,
             "brief": conversation.brief,
+            "summary": conversation.summary,
+            "summarized_count": conversation.summarized_count,
             "is_archived": conversation.is_archived,
             "created_at": conversation.created_at,
             "updated_at": conversation.updated_at,
@@ -42,14 +102,8 @@ class MongoConversationRepository(ConversationRepository):
         conversation.id = str(result.inserted_id)
         return conversation
 
-    async def add_message(self, conversation_id: str, user_id: str, message: Message) -> Conversation:
-        msg_doc = {"role": message.role, "content": message.content, "timestamp": message.timestamp}
-        data = await self._col.find_one_and_update(
-            {"_id": ObjectId(conversation_id), "user_id": user_id},
-            {"$push": {"messages": msg_doc}, "$set": {"updated_at": datetime.utcnow()}},
-            return_document=True,
-        )
-        return self._to_entity(data)
+    def unit_of_work(self, conversation_id: str, user_id: str) -> ConversationUnitOfWork:
+        return MongoConversationUnitOfWork(self._col, self._messages, conversation_id, user_id)
 
     async def update_title(self, conversation_id: str, user_id: str, title: str) -> None:
         await self._col.update_one(
@@ -61,14 +115,34 @@ class MongoConversationRepository(ConversationRepository):
         data = await self._col.find_one_and_update(
             {"_id": ObjectId(conversation_id), "user_id": user_id},
             {"$set": {"brief": brief, "updated_at": datetime.utcnow()}},
+            projection=_WITHOUT_MESSAGES,
             return_document=True,
         )
         return self._to_entity(data)
 
+    async def update_summary(
+        self, conversation_id: str, user_id: str, summary: str, summarized_count: int
+    ) -> None:
+        # Only move forward, so a slower concurrent fold never overwrites a newer summary.
+        # Summaries are bookkeeping, so updated_at (sidebar order) is left alone.
+        await self._col.update_one(
+            {
+                "_id": ObjectId(conversation_id),
+                "user_id": user_id,
+                "$or": [
+                    {"summarized_count": {"$exists": False}},
+                    {"summarized_count": {"$lt": summarized_count}},
+                ],
+            },
+            {"$set": {"summary": summary, "summarized_count": summarized_count}},
+        )
+
     async def delete(self, conversation_id: str, user_id: str) -> None:
-        await self._col.delete_one(
+        result = await self._col.delete_one(
             {"_id": ObjectId(conversation_id), "user_id": user_id}
         )
+        if result.deleted_count:
+            await self._messages.delete_many({"conversation_id": conversation_id, "user_id": user_id})
 
     async def archive(self, conversation_id: str, user_id: str) -> None:
         await self._col.update_one(
@@ -82,16 +156,96 @@ class MongoConversationRepository(ConversationRepository):
             user_id=data["user_id"],
             title=data.get("title", "Nova Conversa"),
             copy_type=data.get("copy_type", "geral"),
-            messages=[
-                Message(
-                    role=m["role"],
-                    content=m["content"],
-                    timestamp=m.get("timestamp", datetime.utcnow()),
-                )
-                for m in data.get("messages", [])
-            ],
+            message_count=data.get("message_count", 0),
+            last_message_preview=data.get("last_message_preview"),
             brief=data.get("brief"),
+            summary=data.get("summary"),
+            summarized_count=data.get("summarized_count", 0),
             is_archived=data.get("is_archived", False),
             created_at=data.get("created_at"),
             updated_at=data.get("updated_at"),
         )
+
+    def _to_message(self, data: dict) -> Message:
+        return Message(
+            role=data["role"],
+            content=data["content"],
+            token_count=data.get("token_count", 0),
+            timestamp=data.get("timestamp", datetime.utcnow()),
+        )
+
+
+class MongoConversationUnitOfWork(ConversationUnitOfWork):
+    """Turns a turn's changes into one conversations update plus one messages insert.
+
+    Both run concurrently on flush, so a flush costs one round trip and
+    stamps updated_at once, however many changes were collected.
+    """
+
+    def __init__(self, conversations, messages, conversation_id: str, user_id: str):
+        self._conversations = conversations
+        self._messages = messages
+        self._conversation_id = conversation_id
+        self._user_id = user_id
+        self._pending_messages: List[Message] = []
+        self._fields: dict = {}
+        self._closed = False
+
+    def add_message(self, message: Message) -> None:
+        self._pending_messages.append(message)
+
+    def set_brief(self, brief: dict) -> None:
+        self._fields["brief"] = brief
+
+    def set_title(self, title: str) -> bool:
+        if self._closed:
+            return False
+        self._fields["title"] = title
+        return True
+
+    async def flush(self) -> bool:
+        # Take the pending changes before awaiting, so changes made meanwhile go to the next flush
+        messages, fields = self._pending_messages, self._fields
+        self._pending_messages, self._fields = [], {}
+        if not messages and not fields:
+            return True
+
+        update = {"$set": {**fields, "updated_at": datetime.utcnow()}}
+        if messages:
+            update["$inc"] = {"message_count": len(messages)}
+            update["$set"]["last_message_preview"] = messages[-1].content[:_PREVIEW_CHARS]
+        writes = [
+            self._conversations.update_one(
+                {"_id": ObjectId(self._conversation_id), "user_id": self._user_id}, update
+            )
+        ]
+        if messages:
+            writes.append(
+                self._messages.insert_many(
+                    [_message_doc(self._conversation_id, self._user_id, m) for m in messages],
+                    ordered=True,
+                )
+            )
+        results = await asyncio.gather(*writes)
+
+        if not results[0].matched_count:
+            # Deleted mid-turn: do not leave its messages behind
+            if messages:
+                await self._messages.delete_many({"_id": {"$in": results[1].inserted_ids}})
+            return False
+        return True
+
+    async def close(self) -> bool:
+        self._closed = True
+        return await self.flush()
+
+
+def _message_doc(conversation_id: str, user_id: str, message: Message) -> dict:
+    return {
+        "conversation_id": conversation_id,
+        "user_id": user_id,
+        "role": message.role,
+        "content": message.content,
+        "token_count": message.token_count,
+        "timestamp": message.timestamp,
+    }
@@ -2,15 +2,26 @@ from typing import List, Optional
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from domain.entities.document import Document
 from domain.repositories.document_repository import DocumentRepository
 
 
 class MongoDocumentRepository(DocumentRepository):
+    INDEXES = {
+        "documents": [
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("conversation_id", ASCENDING), ("created_at", DESCENDING)]),
+        ],
+    }
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self._col = db.documents
 
+    def next_id(self) -> str:
+        return str(ObjectId())
+
     async def find_by_id(self, document_id: str, user_id: str) -> Optional[Document]:
         data = await self._col.find_one(
             {"_id": ObjectId(document_id), "user_id": user_id}
@@ -32,6 +43,7 @@ class MongoDocumentRepository(DocumentRepository):
             "conversation_id": document.conversation_id,
             "filename": document.filename,
             "file_path": document.file_path,
+            "content_hash": document.content_hash,
             "file_size": document.file_size,
             "mime_type": document.mime_type,
             "collection_name": document.collection_name,
@@ -39,6 +51,8 @@ class MongoDocumentRepository(DocumentRepository):
             "total_pages": document.total_pages,
             "created_at": document.created_at,
         }
+        if document.id:
+            doc["_id"] = ObjectId(document.id)
         result = await self._col.insert_one(doc)
         document.id = str(result.inserted_id)
         return document
@@ -55,6 +69,7 @@ class MongoDocumentRepository(DocumentRepository):
             conversation_id=data.get("conversation_id"),
             filename=data["filename"],
             file_path=data["file_path"],
+            content_hash=data.get("content_hash"),
             file_size=data["file_size"],
             mime_type=data.get("mime_type", "application/pdf"),
             collection_name=data["collection_name"],
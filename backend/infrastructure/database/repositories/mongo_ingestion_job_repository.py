@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
+
+from domain.entities.ingestion_job import IngestionJob
+from domain.repositories.ingestion_job_repository import IngestionJobRepository
+
+_UNFINISHED_STAGES = ["queued", "extracting", "chunking", "embedding"]
+
+
+class MongoIngestionJobRepository(IngestionJobRepository):
+    INDEXES = {
+        "ingestion_jobs": [IndexModel([("stage", ASCENDING)])],
+    }
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self._col = db.ingestion_jobs
+
+    async def find_by_id(self, job_id: str, user_id: str) -> Optional[IngestionJob]:
+        data = await self._col.find_one({"_id": ObjectId(job_id), "user_id": user_id})
+        return self._to_entity(data) if data else None
+
+    async def save(self, job: IngestionJob) -> IngestionJob:
+        doc = {
+            "user_id": job.user_id,
+            "conversation_id": job.conversation_id,
+            "filename": job.filename,
+            "file_size": job.file_size,
+            "content_hash": job.content_hash,
+            "pdf_path": job.pdf_path,
+            "stage": job.stage,
+            "total_pages": job.total_pages,
+            "pages_processed": job.pages_processed,
+            "total_chunks": job.total_chunks,
+            "chunks_embedded": job.chunks_embedded,
+            "document_id": job.document_id,
+            "error": job.error,
+            "created_at": job.created_at,
+            "updated_at": job.updated_at,
+        }
+        result = await self._col.insert_one(doc)
+        job.id = str(result.inserted_id)
+        return job
+
+    async def update(self, job_id: str, fields: dict) -> None:
+        await self._col.update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {**fields, "updated_at": datetime.utcnow()}},
+        )
+
+    async def find_unfinished(self) -> List[IngestionJob]:
+        cursor = self._col.find({"stage": {"$in": _UNFINISHED_STAGES}}).sort("created_at", ASCENDING)
+        return [self._to_entity(data) async for data in cursor]
+
+    def _to_entity(self, data: dict) -> IngestionJob:
+        return IngestionJob(
+            id=str(data["_id"]),
+            user_id=data["user_id"],
+            conversation_id=data.get("conversation_id"),
+            filename=data["filename"],
+            file_size=data["file_size"],
+            content_hash=data.get("content_hash"),
+            pdf_path=data.get("pdf_path"),
+            stage=data.get("stage", "queued"),
+            total_pages=data.get("total_pages", 0),
+            pages_processed=data.get("pages_processed", 0),
+            total_chunks=data.get("total_chunks", 0),
+            chunks_embedded=data.get("chunks_embedded", 0),
+            document_id=data.get("document_id"),
+            error=data.get("error"),
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at"),
+        )
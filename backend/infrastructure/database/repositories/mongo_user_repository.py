@@ -2,12 +2,21 @@ from typing import Optional
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
 
 from domain.entities.user import User
 from domain.repositories.user_repository import UserRepository
 
 
 class MongoUserRepository(UserRepository):
+    # email is looked up on every authenticated request
+    INDEXES = {
+        "users": [
+            IndexModel([("email", ASCENDING)], unique=True),
+            IndexModel([("username", ASCENDING)], unique=True),
+        ],
+    }
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self._col = db.users
 
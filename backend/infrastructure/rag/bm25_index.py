@@ -0,0 +1,189 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Words plus SKU/price-like compounds ("ab-1234", "49,90", "v2.1")
+_TOKEN = re.compile(r"\w+(?:[-.,/]\w+)*", re.UNICODE)
+_SPLIT = re.compile(r"[-.,/]")
+
+_K1 = 1.5
+_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        tokens.append(token)
+        parts = _SPLIT.split(token)
+        if len(parts) > 1:
+            # Index the pieces too, so "1234" still finds "ab-1234"
+            tokens.extend(part for part in parts if part)
+    return tokens
+
+
+@dataclass
+class LexicalHit:
+    chunk_id: str
+    score: float
+    coverage: float  # IDF-weighted share of the query terms found in the chunk
+
+
+class _CollectionIndex:
+    def __init__(self, data: Optional[dict] = None):
+        data = data or {}
+        # chunk_id -> [length, conversation_id, document key]
+        self.chunks: Dict[str, list] = data.get("chunks", {})
+        # term -> {chunk_id: term frequency}
+        self.postings: Dict[str, Dict[str, int]] = data.get("postings", {})
+        self.total_length: int = data.get("total_length", 0)
+
+    def to_dict(self) -> dict:
+        return {"chunks": self.chunks, "postings": self.postings, "total_length": self.total_length}
+
+    def add(self, chunk_id: str, text: str, conversation_id: str, document_key: str) -> None:
+        if chunk_id in self.chunks:
+            self.remove([chunk_id])
+        counts = Counter(tokenize(text))
+        length = sum(counts.values())
+        self.chunks[chunk_id] = [length, conversation_id, document_key]
+        self.total_length += length
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[chunk_id] = tf
+
+    def remove(self, chunk_ids: List[str]) -> None:
+        removed = set()
+        for chunk_id in chunk_ids:
+            entry = self.chunks.pop(chunk_id, None)
+            if entry:
+                self.total_length -= entry[0]
+                removed.add(chunk_id)
+        if not removed:
+            return
+        for term in list(self.postings):
+            posting = self.postings[term]
+            for chunk_id in removed & posting.keys():
+                del posting[chunk_id]
+            if not posting:
+                del self.postings[term]
+
+    def search(self, query: str, scopes: List[str], k: int) -> List[LexicalHit]:
+        terms = set(tokenize(query))
+        if not terms or not self.chunks:
+            return []
+        n = len(self.chunks)
+        avg_length = self.total_length / n or 1.0
+        idf = {}
+        for term in terms:
+            df = len(self.postings.get(term, ()))
+            idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        total_idf = sum(idf.values()) or 1.0
+
+        scores: Dict[str, float] = {}
+        matched: Dict[str, float] = {}
+        for term in terms:
+            for chunk_id, tf in self.postings.get(term, {}).items():
+                length, chunk_conversation, _ = self.chunks[chunk_id]
+                if chunk_conversation not in scopes:
+                    continue
+                norm = tf + _K1 * (1 - _B + _B * length / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf[term] * tf * (_K1 + 1) / norm
+                matched[chunk_id] = matched.get(chunk_id, 0.0) + idf[term]
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [LexicalHit(chunk_id, score, matched[chunk_id] / total_idf) for chunk_id, score in ranked]
+
+
+class Bm25Index:
+    """Per-collection BM25 inverted indexes, persisted as JSON under storage/bm25/.
+
+    Chunks are tagged with their conversation (or "general") so a per-user
+    collection can be searched by conversation scope, like the vector filter. Texts are not stored here; hits are resolved through Chroma ids.
+    """
+
+    def __init__(self, base_dir: Path):
+        self._dir = base_dir
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, _CollectionIndex] = {}
+
+    def exists(self, collection_name: str) -> bool:
+        return collection_name in self._indexes or self._path(collection_name).exists()
+
+    def add_chunks(
+        self,
+        collection_name: str,
+        chunk_ids: List[str],
+        texts: List[str],
+        conversation_id: Optional[str],
+        document_key: str,
+    ) -> None:
+        with self._lock:
+            index = self._load(collection_name)
+            for chunk_id, text in zip(chunk_ids, texts):
+                index.add(chunk_id, text, conversation_id or "general", document_key)
+            self._flush(collection_name, index)
+
+    def rebuild(
+        self,
+        collection_name: str,
+        chunk_ids: List[str],
+        texts: List[str],
+        metadatas: List[Optional[dict]],
+    ) -> None:
+        """Replaces the collection's index with the given chunks, as stored in Chroma."""
+        index = _CollectionIndex()
+        for chunk_id, text, metadata in zip(chunk_ids, texts, metadatas):
+            metadata = metadata or {}
+            index.add(
+                chunk_id,
+                text,
+                metadata.get("conversation_id") or "general",
+                metadata.get("document_id") or metadata.get("file_path", ""),
+            )
+        with self._lock:
+            self._indexes[collection_name] = index
+            self._flush(collection_name, index)
+
+    def remove_document(self, collection_name: str, document_key: str) -> None:
+        with self._lock:
+            if not self.exists(collection_name):
+                return
+            index = self._load(collection_name)
+            chunk_ids = [cid for cid, entry in index.chunks.items() if entry[2] == document_key]
+            if chunk_ids:
+                index.remove(chunk_ids)
+                self._flush(collection_name, index)
+
+    def remove_collection(self, collection_name: str) -> None:
+        with self._lock:
+            self._indexes.pop(collection_name, None)
+            self._path(collection_name).unlink(missing_ok=True)
+
+    def search(self, collection_name: str, query: str, scopes: List[str], k: int) -> List[LexicalHit]:
+        with self._lock:
+            if not self.exists(collection_name):
+                return []
+            return self._load(collection_name).search(query, scopes, k)
+
+    def _path(self, collection_name: str) -> Path:
+        return self._dir / f"{collection_name}.json"
+
+    def _load(self, collection_name: str) -> _CollectionIndex:
+        index = self._indexes.get(collection_name)
+        if index is None:
+            path = self._path(collection_name)
+            index = _CollectionIndex(json.loads(path.read_text()) if path.exists() else None)
+            self._indexes[collection_name] = index
+        return index
+
+    def _flush(self, collection_name: str, index: _CollectionIndex) -> None:
+        path = self._path(collection_name)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(index.to_dict(), separators=(",", ":")))
+        os.replace(tmp_path, path)
@@ -1,23 +1,84 @@
-import io
-import os
-import uuid
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional
 
 import chromadb
+import numpy as np
+from chromadb.api.models.Collection import Collection
 from chromadb.config import Settings
-from langchain.docstore.document import Document as LangchainDocument
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings
-from pypdf import PdfReader
 
 from domain.gateways.rag_gateway import RAGGateway
+from domain.gateways.token_counter import TokenCounter
+from infrastructure.rag.bm25_index import Bm25Index
+from infrastructure.rag.collection_registry import CollectionRegistry
+from infrastructure.rag.context_builder import Candidate, ContextBuilder, cosine
+from infrastructure.rag.embedding_cache import EmbeddingCache
+from infrastructure.rag.embedding_providers import make_embedding_provider
+from infrastructure.rag.pdf_blob_store import PdfBlobStore
+from infrastructure.rag.retrieval_cache import RetrievalCache
+from infrastructure.rag.pdf_text_extractor import PdfTextExtractor
+from infrastructure.rag.query_embedding_cache import QueryEmbeddingCache
+
+# Cached vectors written to Chroma per add() call
+_CACHED_WRITE_BATCH = 256
+
+# Reciprocal-rank fusion constant and candidates fetched per retriever for each result kept
+_RRF_K = 60
+_CANDIDATES_PER_RESULT = 4
+
+# Collections created before providers were recorded were all built with this one
+_LEGACY_PROVIDER = "openai:text-embedding-ada-002"
+
+
+async def _no_progress(**_) -> None:
+    return None
+
+
+def _reciprocal_rank_fusion(rankings: List[List[str]]) -> List[str]:
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, 1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (_RRF_K + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def _sha256_file(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            hasher.update(chunk)
+    return hasher.hexdigest()
 
 
 class ChromaDBRAGGateway(RAGGateway):
-    def __init__(self, openai_api_key: str, base_storage_dir: str):
-        self._embeddings = OpenAIEmbeddings(openai_api_key=openai_api_key)
+    def __init__(
+        self,
+        openai_api_key: str,
+        base_storage_dir: str,
+        token_counter: TokenCounter,
+        max_workers: int = 4,
+        extraction_workers: int = 2,
+        pages_per_batch: int = 8,
+        embedding_cache_max_entries: int = 200_000,
+        collection_layout: str = "per_user",
+        embedding_provider: str = "openai",
+        embedding_model: str = "text-embedding-ada-002",
+        local_embedding_model: str = "all-MiniLM-L6-v2",
+        embedding_batch_tokens: int = 20_000,
+        embedding_concurrency: int = 4,
+        lexical_shortcut_coverage: float = 0.9,
+        context_max_tokens: int = 1200,
+        min_similarity: float = 0.75,
+        mmr_lambda: float = 0.7,
+        result_cache_size: int = 1024,
+        result_cache_ttl_seconds: float = 600,
+        query_embedding_cache_mb: int = 32,
+    ):
+        self._collection_layout = collection_layout
         self._splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000, chunk_overlap=200, length_function=len
         )
@@ -28,30 +89,112 @@ class ChromaDBRAGGateway(RAGGateway):
 
         self._pdf_dir.mkdir(parents=True, exist_ok=True)
         self._chroma_dir.mkdir(parents=True, exist_ok=True)
+        self._blobs = PdfBlobStore(self._base_dir)
+
+        self._embeddings = make_embedding_provider(
+            embedding_provider,
+            openai_api_key=openai_api_key,
+            model=embedding_model,
+            local_model=local_embedding_model,
+            batch_tokens=embedding_batch_tokens,
+            concurrency=embedding_concurrency,
+        )
+        self._embedding_cache = EmbeddingCache(
+            self._base_dir / "embedding_cache.sqlite3",
+            max_entries=embedding_cache_max_entries,
+        )
 
         self._chroma_client = chromadb.PersistentClient(
             path=str(self._chroma_dir),
             settings=Settings(anonymized_telemetry=False, allow_reset=True),
         )
 
+        # Chroma is synchronous; its calls run here so the event loop never blocks
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chroma")
+        self._collections: Dict[str, Collection] = {}
+        self._extractor = PdfTextExtractor(
+            max_workers=extraction_workers, pages_per_batch=pages_per_batch
+        )
+
+        self._bm25 = Bm25Index(self._base_dir / "bm25")
+        # A lexical top hit covering this share of the query answers it without embedding
+        self._lexical_shortcut_coverage = lexical_shortcut_coverage
+
+        self._context_builder = ContextBuilder(
+            token_counter,
+            max_tokens=context_max_tokens,
+            min_relevance=min_similarity,
+            mmr_lambda=mmr_lambda,
+        )
+
+        self._results = RetrievalCache(result_cache_size, result_cache_ttl_seconds)
+        self._query_embeddings = QueryEmbeddingCache(query_embedding_cache_mb * 1024 * 1024)
+
+        self._registry = CollectionRegistry(self._base_dir / "rag_scopes.json")
+        if not self._registry.exists_on_disk:
+            self._bootstrap_registry()
+
     async def process_pdf(
         self,
-        pdf_bytes: bytes,
+        pdf_path: str,
         filename: str,
         user_id: str,
+        document_id: str,
         conversation_id: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        progress: Optional[Callable[..., Awaitable[None]]] = None,
     ) -> dict:
-        saved_path = self._save_pdf(pdf_bytes, user_id, filename)
-        text, total_pages = self._extract_text(pdf_bytes)
-        metadata = {
-            "filename": filename,
-            "user_id": user_id,
-            "conversation_id": conversation_id or "general",
-            "file_path": saved_path,
-        }
-        chunks = self._chunk_text(text, metadata)
-        collection_name = f"user_{user_id}_{conversation_id or 'general'}"
-        self._create_embeddings(chunks, collection_name)
+        report = progress or _no_progress
+        content_hash = content_hash or await self._run_blocking(_sha256_file, pdf_path)
+        saved_path = await self._run_blocking(self._blobs.acquire, content_hash, pdf_path)
+        collection_name = self.collection_for(user_id, conversation_id)
+        try:
+            await report(stage="extracting")
+            derived = await self._run_blocking(self._blobs.load_derived, content_hash)
+            if derived is None:
+                derived = await self._extract_and_split(saved_path, filename, report)
+                await self._run_blocking(self._blobs.save_derived, content_hash, derived)
+            else:
+                # Same bytes were processed before: reuse their text and chunks
+                await report(pages_processed=derived["total_pages"], total_pages=derived["total_pages"])
+
+            metadata = {
+                "filename": filename,
+                "user_id": user_id,
+                "conversation_id": conversation_id or "general",
+                "file_path": saved_path,
+                "content_hash": content_hash,
+                "document_id": document_id,
+            }
+            chunks = derived["chunks"]
+
+            await report(stage="embedding", total_chunks=len(chunks), chunks_embedded=0)
+            await self._create_embeddings(chunks, metadata, collection_name, document_id, report)
+            # Adding chunks creates the index file, so older chunks must be in it first
+            collection = await self._run_blocking(self._get_collection, collection_name)
+            await self._run_blocking(self._ensure_lexical_index, collection)
+            await self._run_blocking(
+                self._bm25.add_chunks,
+                collection_name,
+                [f"{document_id}:{i}" for i in range(len(chunks))],
+                chunks,
+                conversation_id,
+                document_id,
+            )
+        except BaseException:
+            # Also on cancellation (shutdown), so no partial document is left behind
+            await self._run_blocking(self._remove_document_vectors, collection_name, document_id)
+            await self._run_blocking(self._bm25.remove_document, collection_name, document_id)
+            await self._run_blocking(self._blobs.release, saved_path)
+            self._results.bump(collection_name)
+            raise
+        self._results.bump(collection_name)
+        self._registry.record_document(
+            CollectionRegistry.scope_key(collection_name, conversation_id),
+            len(chunks),
+            self._embeddings.name,
+        )
+        total_pages = derived["total_pages"]
 
         return {
             "filename": filename,
@@ -59,35 +202,99 @@ class ChromaDBRAGGateway(RAGGateway):
             "total_chunks": len(chunks),
             "collection_name": collection_name,
             "file_path": saved_path,
+            "content_hash": content_hash,
+            "page_seconds": derived["page_seconds"],
             "message": "PDF processado e salvo localmente com sucesso",
         }
 
-    async def search_similar(self, query: str, collection_name: str, k: int = 3) -> str:
+    def collection_for(self, user_id: str, conversation_id: Optional[str] = None) -> str:
+        if self._collection_layout == "per_conversation":
+            return f"user_{user_id}_{conversation_id or 'general'}"
+        # One collection (one HNSW index) per user; conversations are a metadata filter
+        return f"user_{user_id}"
+
+    def has_documents(self, user_id: str, conversation_id: Optional[str] = None) -> bool:
+        return self._registry.has_documents(
+            CollectionRegistry.scope_key(self.collection_for(user_id, conversation_id), conversation_id)
+        )
+
+    async def search_similar(
+        self,
+        query: str,
+        user_id: str,
+        conversation_id: Optional[str] = None,
+        k: int = 6,
+    ) -> str:
+        # The conversation's own documents and the user's general library, in one retrieval
+        targets = self._retrieval_targets(user_id, conversation_id)
+        if not targets:
+            return ""
+        cache_key = self._results.key(list(targets), conversation_id, k, query)
+        cached = self._results.get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            vectorstore = Chroma(
-                collection_name=collection_name,
-                embedding_function=self._embeddings,
-                client=self._chroma_client,
-            )
-            docs = vectorstore.similarity_search(query, k=k)
-            if not docs:
-                return ""
-            context = "Contexto dos documentos:\n\n"
-            for i, doc in enumerate(docs, 1):
-                context += f"Trecho {i}:\n{doc.page_content}\n\n"
-            return context
+            context = await self._retrieve(query, targets, k)
         except Exception as e:
             print(f"Erro na busca RAG: {e}")
             return ""
+        self._results.put(cache_key, context)
+        return context
+
+    async def delete_document(
+        self,
+        collection_name: str,
+        document_id: str,
+        file_path: str,
+        conversation_id: Optional[str] = None,
+    ) -> None:
+        try:
+            removed = await self._run_blocking(self._remove_document_vectors, collection_name, document_id)
+            if not removed:
+                # Vectors written before per-document ids are only tagged with their file path
+                removed = await self._run_blocking(
+                    self._remove_document_vectors, collection_name, None, file_path
+                )
+                await self._run_blocking(self._bm25.remove_document, collection_name, file_path)
+            else:
+                await self._run_blocking(self._bm25.remove_document, collection_name, document_id)
+            self._registry.remove_document(
+                CollectionRegistry.scope_key(collection_name, conversation_id), removed
+            )
+        except Exception as e:
+            print(f"Erro ao deletar vetores do documento: {e}")
+        finally:
+            self._results.bump(collection_name)
 
     def delete_collection(self, collection_name: str) -> None:
+        self._registry.remove_collection(collection_name)
+        self._bm25.remove_collection(collection_name)
+        self._results.bump(collection_name)
+        self._collections.pop(collection_name, None)
         try:
             self._chroma_client.delete_collection(collection_name)
         except Exception as e:
             print(f"Erro ao deletar coleção: {e}")
 
+    def cache_stats(self) -> dict:
+        return {
+            "embedding_cache": self._embedding_cache.stats(),
+            "retrieval_cache": self._results.stats(),
+            "query_embedding_cache": self._query_embeddings.stats(),
+        }
+
+    def close(self) -> None:
+        self._extractor.shutdown()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._embeddings.close()
+        self._embedding_cache.close()
+        self._blobs.close()
+
     def delete_file(self, file_path: str) -> None:
         try:
+            if self._blobs.release(file_path):
+                return
+            # Uploads stored before content addressing live under pdfs/{user_id}/
             full_path = self._base_dir / file_path
             if full_path.exists():
                 full_path.unlink()
@@ -96,29 +303,220 @@ class ChromaDBRAGGateway(RAGGateway):
 
     # --- private helpers ---
 
-    def _save_pdf(self, pdf_bytes: bytes, user_id: str, filename: str) -> str:
-        user_dir = self._pdf_dir / user_id
-        user_dir.mkdir(exist_ok=True)
-        unique_id = str(uuid.uuid4())[:8]
-        safe_name = f"{unique_id}_{filename}"
-        file_path = user_dir / safe_name
-        file_path.write_bytes(pdf_bytes)
-        return str(file_path.relative_to(self._base_dir))
-
-    def _extract_text(self, pdf_bytes: bytes) -> tuple[str, int]:
-        reader = PdfReader(io.BytesIO(pdf_bytes))
-        total_pages = len(reader.pages)
-        text = "".join(page.extract_text() + "\n" for page in reader.pages)
-        return text, total_pages
-
-    def _chunk_text(self, text: str, metadata: dict) -> List[LangchainDocument]:
-        docs = [LangchainDocument(page_content=text, metadata=metadata)]
-        return self._splitter.split_documents(docs)
-
-    def _create_embeddings(self, chunks: List[LangchainDocument], collection_name: str) -> None:
-        Chroma.from_documents(
-            documents=chunks,
-            embedding=self._embeddings,
-            collection_name=collection_name,
-            client=self._chroma_client,
+    def _retrieval_targets(self, user_id: str, conversation_id: Optional[str]) -> Dict[str, List[str]]:
+        # collection name -> conversation scopes to search in it, skipping scopes with no documents
+        targets: Dict[str, List[str]] = {}
+        for scope in dict.fromkeys([conversation_id, None]):
+            collection_name = self.collection_for(user_id, scope)
+            if self._registry.has_documents(CollectionRegistry.scope_key(collection_name, scope)):
+                targets.setdefault(collection_name, []).append(scope or "general")
+        return targets
+
+    async def _retrieve(self, query: str, targets: Dict[str, List[str]], k: int) -> str:
+        candidates = k * _CANDIDATES_PER_RESULT
+        collections: Dict[str, Collection] = {}
+        lexical = []
+        for collection_name, scopes in targets.items():
+            collection = await self._run_blocking(self._get_collection, collection_name)
+            if collection is None:
+                continue
+            await self._run_blocking(self._check_provider, collection)
+            collections[collection_name] = collection
+            hits = await self._run_blocking(
+                self._lexical_search, collection, query, scopes, candidates
+            )
+            lexical.extend((hit, collection_name) for hit in hits)
+        if not collections:
+            return ""
+        lexical.sort(key=lambda item: item[0].score, reverse=True)
+        coverage = {hit.chunk_id: hit.coverage for hit, _ in lexical}
+        owner = {hit.chunk_id: collection_name for hit, collection_name in lexical}
+
+        query_vector = None
+        if lexical and lexical[0][0].coverage >= self._lexical_shortcut_coverage:
+            # Exact names/SKUs/prices matched: lexical ranking alone is good enough
+            ids = list(coverage)[:candidates]
+        else:
+            # One query embedding serves every collection searched
+            query_vector = await self._query_embeddings.get_or_embed(
+                self._embeddings.name, query, self._embeddings.embed_query
+            )
+            rankings = [list(coverage)]
+            for collection_name, collection in collections.items():
+                scopes = targets[collection_name]
+                scope_filter = {"$in": scopes} if len(scopes) > 1 else scopes[0]
+                result = await self._run_blocking(
+                    collection.query,
+                    query_embeddings=[query_vector.tolist()],
+                    n_results=candidates,
+                    where={"conversation_id": scope_filter},
+                    include=[],
+                )
+                vector_ids = result["ids"][0] if result["ids"] else []
+                owner.update((chunk_id, collection_name) for chunk_id in vector_ids)
+                rankings.append(vector_ids)
+            ids = _reciprocal_rank_fusion(rankings)[:candidates]
+        if not ids:
+            return ""
+
+        pool = []
+        for collection_name, collection in collections.items():
+            wanted = [chunk_id for chunk_id in ids if owner[chunk_id] == collection_name]
+            if not wanted:
+                continue
+            found = await self._run_blocking(
+                collection.get, ids=wanted, include=["documents", "embeddings"]
+            )
+            for chunk_id, text, embedding in zip(found["ids"], found["documents"], found["embeddings"]):
+                vector = np.asarray(embedding, dtype=np.float32)
+                similarity = cosine(query_vector, vector) if query_vector is not None else 0.0
+                # Lexical matches count as relevant even when their embedding is not close
+                relevance = max(similarity, coverage.get(chunk_id, 0.0))
+                pool.append(Candidate(chunk_id, text, vector, relevance))
+        # Both scopes compete for the same excerpt slots and token budget
+        return self._context_builder.build(pool, max_chunks=k)
+
+    async def _run_blocking(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    def _get_collection(self, collection_name: str) -> Optional[Collection]:
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            try:
+                # Vectors are always computed by us, so no Chroma-side embedding function
+                collection = self._chroma_client.get_collection(collection_name, embedding_function=None)
+            except ValueError:
+                return None
+            self._collections[collection_name] = collection
+        return collection
+
+    def _bootstrap_registry(self) -> None:
+        # First run with an existing chroma_db: seed the registry from what is on disk
+        for collection in self._chroma_client.list_collections():
+            metadatas = collection.get(include=["metadatas"])["metadatas"]
+            scopes: Dict[str, dict] = {}
+            for metadata in metadatas:
+                metadata = metadata or {}
+                key = CollectionRegistry.scope_key(collection.name, metadata.get("conversation_id"))
+                scope = scopes.setdefault(key, {"documents": set(), "chunks": 0})
+                scope["documents"].add(metadata.get("document_id") or metadata.get("file_path"))
+                scope["chunks"] += 1
+            for key, scope in scopes.items():
+                self._registry.set(key, len(scope["documents"]), scope["chunks"], self._embeddings.name)
+
+    def _lexical_search(self, collection: Collection, query: str, scopes: List[str], k: int):
+        self._ensure_lexical_index(collection)
+        return self._bm25.search(collection.name, query, scopes, k)
+
+    def _ensure_lexical_index(self, collection: Collection) -> None:
+        if not self._bm25.exists(collection.name):
+            # Collection indexed before BM25 existed: build its lexical index once from Chroma
+            page = collection.get(include=["documents", "metadatas"])
+            self._bm25.rebuild(collection.name, page["ids"], page["documents"], page["metadatas"])
+
+    async def _extract_and_split(
+        self, pdf_path: str, filename: str, report: Callable[..., Awaitable[None]]
+    ) -> dict:
+        extraction = await self._extractor.extract(
+            str(self._base_dir / pdf_path),
+            lambda done, total: report(pages_processed=done, total_pages=total),
+        )
+        slowest = max(extraction.page_seconds, default=0.0)
+        print(
+            f"PDF '{filename}': {extraction.total_pages} páginas extraídas em "
+            f"{sum(extraction.page_seconds):.2f}s de CPU (página mais lenta: {slowest:.2f}s)"
         )
+        await report(stage="chunking")
+        chunks = await self._run_blocking(self._splitter.split_text, extraction.text)
+        return {
+            "total_pages": extraction.total_pages,
+            "page_seconds": [round(seconds, 4) for seconds in extraction.page_seconds],
+            "chunks": chunks,
+        }
+
+    def _remove_document_vectors(
+        self,
+        collection_name: str,
+        document_id: Optional[str],
+        file_path: Optional[str] = None,
+    ) -> int:
+        collection = self._get_collection(collection_name)
+        if collection is None:
+            return 0
+        where = {"document_id": document_id} if document_id else {"file_path": file_path}
+        ids = collection.get(where=where, include=[])["ids"]
+        if ids:
+            collection.delete(ids=ids)
+        return len(ids)
+
+    def _get_or_create_collection(self, collection_name: str) -> Collection:
+        collection = self._get_collection(collection_name)
+        if collection is None:
+            collection = self._chroma_client.get_or_create_collection(
+                collection_name,
+                metadata={"embedding_provider": self._embeddings.name},
+                embedding_function=None,
+            )
+            self._collections[collection_name] = collection
+        self._check_provider(collection)
+        return collection
+
+    def _check_provider(self, collection: Collection) -> None:
+        metadata = collection.metadata or {}
+        provider = metadata.get("embedding_provider")
+        if provider is None:
+            provider = _LEGACY_PROVIDER if collection.count() else self._embeddings.name
+            collection.modify(metadata={**metadata, "embedding_provider": provider})
+        if provider != self._embeddings.name:
+            raise ValueError(
+                f"A coleção {collection.name} foi criada com {provider}, "
+                f"mas EMBEDDING_PROVIDER atual gera vetores {self._embeddings.name}"
+            )
+
+    async def _create_embeddings(
+        self,
+        chunks: List[str],
+        metadata: dict,
+        collection_name: str,
+        document_id: str,
+        report: Callable[..., Awaitable[None]],
+    ) -> None:
+        # Appends to the collection; other documents' vectors are left untouched
+        collection = await self._run_blocking(self._get_or_create_collection, collection_name)
+        embedded = 0
+
+        async def store(indices: List[int], vectors: List[List[float]]) -> None:
+            nonlocal embedded
+            await self._run_blocking(
+                collection.add,
+                ids=[f"{document_id}:{i}" for i in indices],
+                embeddings=vectors,
+                documents=[chunks[i] for i in indices],
+                metadatas=[dict(metadata) for _ in indices],
+            )
+            embedded += len(indices)
+            await report(chunks_embedded=embedded)
+
+        cached = await self._run_blocking(self._embedding_cache.get_many, self._embeddings.name, chunks)
+        hits = [i for i, vector in enumerate(cached) if vector is not None]
+        for start in range(0, len(hits), _CACHED_WRITE_BATCH):
+            batch = hits[start:start + _CACHED_WRITE_BATCH]
+            await store(batch, [cached[i] for i in batch])
+
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        if not missing:
+            return
+
+        async def store_fresh(batch: List[int], vectors: List[List[float]]) -> None:
+            indices = [missing[i] for i in batch]
+            await self._run_blocking(
+                self._embedding_cache.put_many,
+                self._embeddings.name,
+                [chunks[i] for i in indices],
+                vectors,
+            )
+            await store(indices, vectors)
+
+        # Batches land in Chroma as they finish, while later ones are still in flight
+        await self._embeddings.embed_documents([chunks[i] for i in missing], on_batch=store_fresh)
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class CollectionRegistry:
+    """Which retrieval scopes hold indexed documents, persisted as JSON.
+
+    Entries are keyed by ``<collection>/<conversation_id or "general">`` so
+    a collection shared by several conversations is still tracked per
+    conversation. Lets the chat path answer "is there anything to
+    retrieve?" from memory instead of embedding the query and asking Chroma.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        if path.exists():
+            self._entries = json.loads(path.read_text())
+
+    @property
+    def exists_on_disk(self) -> bool:
+        return self._path.exists()
+
+    @staticmethod
+    def scope_key(collection_name: str, conversation_id: Optional[str]) -> str:
+        return f"{collection_name}/{conversation_id or 'general'}"
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._entries.get(key)
+
+    def has_documents(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return bool(entry and entry["chunks"] > 0)
+
+    def record_document(self, key: str, chunks: int, embedding_model: str) -> None:
+        with self._lock:
+            entry = self._entries.setdefault(
+                key, {"documents": 0, "chunks": 0, "embedding_model": embedding_model}
+            )
+            entry["documents"] += 1
+            entry["chunks"] += chunks
+            entry["embedding_model"] = embedding_model
+            self._flush()
+
+    def remove_document(self, key: str, chunks: int) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry["documents"] = max(entry["documents"] - 1, 0)
+            entry["chunks"] = max(entry["chunks"] - chunks, 0)
+            if entry["documents"] == 0 or entry["chunks"] == 0:
+                del self._entries[key]
+            self._flush()
+
+    def set(self, key: str, documents: int, chunks: int, embedding_model: str) -> None:
+        with self._lock:
+            self._entries[key] = {
+                "documents": documents,
+                "chunks": chunks,
+                "embedding_model": embedding_model,
+            }
+            self._flush()
+
+    def remove_collection(self, collection_name: str) -> None:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(f"{collection_name}/")]
+            for key in keys:
+                del self._entries[key]
+            if keys:
+                self._flush()
+
+    def _flush(self) -> None:
+        tmp_path = self._path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._entries, indent=2))
+        os.replace(tmp_path, self._path)
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from domain.gateways.token_counter import TokenCounter
+
+_HEADER = "Contexto dos documentos:\n\n"
+# Longest chunk overlap looked for between neighbours (the splitter uses 200 characters)
+_MAX_OVERLAP_CHARS = 400
+
+
+@dataclass
+class Candidate:
+    chunk_id: str
+    text: str
+    embedding: Optional[np.ndarray]
+    relevance: float  # cosine similarity to the query, or BM25 coverage when not embedded
+
+
+class ContextBuilder:
+    """Turns retrieval candidates into the prompt context.
+
+    Candidates below ``min_relevance`` are dropped, the rest are picked by MMR
+    (relevance vs. similarity to what was already picked, near-duplicates
+    skipped outright), and chunks are added until ``max_tokens`` is spent.
+    Text repeated from the previous chunk of the same document is trimmed.
+    """
+
+    def __init__(
+        self,
+        token_counter: TokenCounter,
+        max_tokens: int = 1200,
+        min_relevance: float = 0.75,
+        mmr_lambda: float = 0.7,
+        duplicate_similarity: float = 0.95,
+    ):
+        self._token_counter = token_counter
+        self._max_tokens = max_tokens
+        self._min_relevance = min_relevance
+        self._mmr_lambda = mmr_lambda
+        self._duplicate_similarity = duplicate_similarity
+
+    def build(self, candidates: List[Candidate], max_chunks: int) -> str:
+        pool = [c for c in candidates if c.relevance >= self._min_relevance]
+        selected = self._select(pool, max_chunks)
+        if not selected:
+            return ""
+
+        emitted: Dict[str, str] = {}
+        budget = self._max_tokens - self._token_counter.count(_HEADER)
+        parts: List[str] = []
+        for candidate in selected:
+            text = _strip_overlap(emitted.get(_previous_chunk_id(candidate.chunk_id)), candidate.text)
+            part = f"Trecho {len(parts) + 1}:\n{text}\n\n"
+            tokens = self._token_counter.count(part)
+            if tokens > budget:
+                # A shorter chunk further down may still fit
+                continue
+            parts.append(part)
+            emitted[candidate.chunk_id] = candidate.text
+            budget -= tokens
+        if not parts:
+            return ""
+        return _HEADER + "".join(parts)
+
+    def _select(self, pool: List[Candidate], max_chunks: int) -> List[Candidate]:
+        selected: List[Candidate] = []
+        remaining = sorted(pool, key=lambda c: c.relevance, reverse=True)
+        while remaining and len(selected) < max_chunks:
+            best, best_score = None, None
+            for candidate in remaining:
+                redundancy = max((_similarity(candidate, other) for other in selected), default=0.0)
+                if redundancy >= self._duplicate_similarity:
+                    continue
+                score = self._mmr_lambda * candidate.relevance - (1 - self._mmr_lambda) * redundancy
+                if best_score is None or score > best_score:
+                    best, best_score = candidate, score
+            if best is None:
+                break
+            selected.append(best)
+            remaining.remove(best)
+        return selected
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    denominator = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(np.dot(a, b)) / denominator if denominator else 0.0
+
+
+def _similarity(a: Candidate, b: Candidate) -> float:
+    if a.embedding is None or b.embedding is None:
+        return 1.0 if a.text == b.text else 0.0
+    return cosine(a.embedding, b.embedding)
+
+
+def _previous_chunk_id(chunk_id: str) -> Optional[str]:
+    # Chunk ids are "<document_id>:<index>"
+    document_id, _, index = chunk_id.rpartition(":")
+    if not document_id or not index.isdigit() or index == "0":
+        return None
+    return f"{document_id}:{int(index) - 1}"
+
+
+def _strip_overlap(previous: Optional[str], text: str) -> str:
+    if not previous:
+        return text
+    tail = previous[-_MAX_OVERLAP_CHARS:]
+    for size in range(min(len(tail), len(text)), 20, -1):
+        if text.startswith(tail[-size:]):
+            return text[size:].lstrip()
+    return text
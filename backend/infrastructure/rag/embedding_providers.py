@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import math
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Optional
+
+from openai import AsyncOpenAI
+
+from infrastructure.rag.embedding_scheduler import EmbeddingScheduler
+
+BatchCallback = Callable[[List[int], List[List[float]]], Awaitable[None]]
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class EmbeddingProvider(ABC):
+    """Turns text into vectors for the RAG gateway.
+
+    ``name`` identifies the vector space ("<backend>:<model>"); it keys the
+    embedding cache and is recorded on every Chroma collection, since vectors
+    from different providers cannot be compared.
+    """
+
+    name: str
+
+    @abstractmethod
+    async def embed_documents(
+        self, texts: List[str], on_batch: Optional[BatchCallback] = None
+    ) -> List[List[float]]:
+        pass
+
+    @abstractmethod
+    async def embed_query(self, text: str) -> List[float]:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    def __init__(self, api_key: str, model: str, batch_tokens: int = 20_000, concurrency: int = 4):
+        self.name = f"openai:{model}"
+        self._model = model
+        self._client = AsyncOpenAI(api_key=api_key)
+        self._scheduler = EmbeddingScheduler(
+            self._client, model=model, max_batch_tokens=batch_tokens, concurrency=concurrency
+        )
+
+    async def embed_documents(
+        self, texts: List[str], on_batch: Optional[BatchCallback] = None
+    ) -> List[List[float]]:
+        return await self._scheduler.embed(texts, on_batch=on_batch)
+
+    async def embed_query(self, text: str) -> List[float]:
+        response = await self._client.embeddings.create(model=self._model, input=[text])
+        return response.data[0].embedding
+
+
+class _LocalEmbeddingProvider(EmbeddingProvider):
+    """Base for CPU-local models: encoding runs on a dedicated thread, in fixed-size batches."""
+
+    def __init__(self, batch_size: int = 32):
+        self._batch_size = batch_size
+        # One thread: the models parallelise internally and are not guaranteed thread-safe
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embeddings")
+
+    @abstractmethod
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        pass
+
+    async def embed_documents(
+        self, texts: List[str], on_batch: Optional[BatchCallback] = None
+    ) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self._batch_size):
+            batch = list(range(start, min(start + self._batch_size, len(texts))))
+            batch_vectors = await loop.run_in_executor(
+                self._executor, self._encode, [texts[i] for i in batch]
+            )
+            vectors.extend(batch_vectors)
+            if on_batch:
+                await on_batch(batch, batch_vectors)
+        return vectors
+
+    async def embed_query(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        return (await loop.run_in_executor(self._executor, self._encode, [text]))[0]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class OnnxEmbeddingProvider(_LocalEmbeddingProvider):
+    """all-MiniLM-L6-v2 on onnxruntime, as bundled with chromadb (downloaded on first use)."""
+
+    def __init__(self, batch_size: int = 32):
+        super().__init__(batch_size)
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+        self.name = f"onnx:{ONNXMiniLM_L6_V2.MODEL_NAME}"
+        self._model = ONNXMiniLM_L6_V2()
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        return [list(map(float, vector)) for vector in self._model(texts)]
+
+
+class SentenceTransformerEmbeddingProvider(_LocalEmbeddingProvider):
+    def __init__(self, model: str, batch_size: int = 32):
+        super().__init__(batch_size)
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError(
+                "EMBEDDING_PROVIDER=sentence-transformers requer o pacote sentence-transformers "
+                "(pip install sentence-transformers)"
+            ) from e
+
+        self.name = f"sentence-transformers:{model}"
+        self._model = SentenceTransformer(model, device="cpu")
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._model.encode(
+            texts, batch_size=self._batch_size, normalize_embeddings=True, show_progress_bar=False
+        )
+        return vectors.tolist()
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """Deterministic bag-of-words hashing; no model, no network. Meant for tests and local runs."""
+
+    def __init__(self, dimensions: int = 384):
+        self.name = f"hashing:{dimensions}"
+        self._dimensions = dimensions
+
+    async def embed_documents(
+        self, texts: List[str], on_batch: Optional[BatchCallback] = None
+    ) -> List[List[float]]:
+        vectors = [self._encode(text) for text in texts]
+        if on_batch and texts:
+            await on_batch(list(range(len(texts))), vectors)
+        return vectors
+
+    async def embed_query(self, text: str) -> List[float]:
+        return self._encode(text)
+
+    def _encode(self, text: str) -> List[float]:
+        vector = [0.0] * self._dimensions
+        for token in _TOKEN.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            # Signed hashing keeps collisions from only ever adding up
+            vector[value % self._dimensions] += 1.0 if value >> 63 else -1.0
+        norm = math.sqrt(sum(x * x for x in vector))
+        return [x / norm for x in vector] if norm else vector
+
+
+def make_embedding_provider(
+    provider: str,
+    openai_api_key: str,
+    model: str,
+    local_model: str,
+    batch_tokens: int = 20_000,
+    concurrency: int = 4,
+) -> EmbeddingProvider:
+    if provider == "openai":
+        return OpenAIEmbeddingProvider(openai_api_key, model, batch_tokens, concurrency)
+    if provider == "onnx":
+        return OnnxEmbeddingProvider()
+    if provider == "sentence-transformers":
+        return SentenceTransformerEmbeddingProvider(local_model)
+    if provider == "hashing":
+        return HashingEmbeddingProvider()
+    raise ValueError(f"EMBEDDING_PROVIDER inválido: {provider}")
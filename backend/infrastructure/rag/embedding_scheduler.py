@@ -0,0 +1,115 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, List, Optional
+
+import openai
+import tiktoken
+
+# Transient failures worth retrying; anything else (bad key, bad input) fails fast
+_RETRYABLE = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class EmbeddingScheduler:
+    """Embeds many texts through the OpenAI API in token-sized, concurrent batches.
+
+    Texts are packed into batches of at most ``max_batch_tokens`` (tiktoken
+    count) and ``max_batch_size`` inputs; up to ``concurrency`` batches are in
+    flight at once. 429s and transient errors are retried with jittered
+    exponential backoff. Each finished batch is handed to ``on_batch`` right
+    away, so callers can store vectors while later batches are still running.
+    """
+
+    def __init__(
+        self,
+        client: openai.AsyncOpenAI,
+        model: str,
+        max_batch_tokens: int = 20_000,
+        max_batch_size: int = 512,
+        concurrency: int = 4,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ):
+        self._client = client
+        self._model = model
+        self._max_batch_tokens = max_batch_tokens
+        self._max_batch_size = max_batch_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._max_retries = max_retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        try:
+            self._encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self._encoding = tiktoken.get_encoding("cl100k_base")
+
+    def plan_batches(self, texts: List[str]) -> List[List[int]]:
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for index, text in enumerate(texts):
+            tokens = len(self._encoding.encode(text, disallowed_special=()))
+            if current and (
+                current_tokens + tokens > self._max_batch_tokens
+                or len(current) >= self._max_batch_size
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def embed(
+        self,
+        texts: List[str],
+        on_batch: Optional[Callable[[List[int], List[List[float]]], Awaitable[None]]] = None,
+    ) -> List[List[float]]:
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+
+        async def run(batch: List[int]) -> None:
+            async with self._semaphore:
+                batch_vectors = await self._request([texts[i] for i in batch])
+            for index, vector in zip(batch, batch_vectors):
+                vectors[index] = vector
+            if on_batch:
+                await on_batch(batch, batch_vectors)
+
+        tasks = [asyncio.create_task(run(batch)) for batch in self.plan_batches(texts)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return vectors
+
+    async def _request(self, inputs: List[str]) -> List[List[float]]:
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.embeddings.create(model=self._model, input=inputs)
+                return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+            except _RETRYABLE as e:
+                attempt += 1
+                if attempt > self._max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt, e))
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self._max_delay)
+            except ValueError:
+                pass
+        delay = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        # Full jitter keeps concurrent batches from retrying in lockstep
+        return random.uniform(0, delay)
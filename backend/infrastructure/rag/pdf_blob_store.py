@@ -0,0 +1,95 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class PdfBlobStore:
+    """Content-addressed PDF storage with reference counting.
+
+    Every distinct file is stored once as ``pdfs/blobs/<sha[:2]>/<sha>.pdf``
+    no matter how many documents point at it. Work derived from the bytes
+    (extracted text, chunks) is kept next to it and reused by later uploads;
+    everything is removed when the last reference is released.
+    """
+
+    def __init__(self, base_dir: Path):
+        self._base_dir = base_dir
+        self._blob_dir = base_dir / "pdfs" / "blobs"
+        self._derived_dir = base_dir / "extracted"
+        self._blob_dir.mkdir(parents=True, exist_ok=True)
+        self._derived_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(base_dir / "pdf_blobs.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            " sha256 TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " refs INTEGER NOT NULL"
+            ")"
+        )
+        self._conn.commit()
+
+    def relative_path(self, sha256: str) -> str:
+        return str(self._blob_path(sha256).relative_to(self._base_dir))
+
+    def acquire(self, sha256: str, source_path: str) -> str:
+        """Takes ownership of ``source_path``: moved into place, or dropped if already stored."""
+        path = self._blob_path(sha256)
+        try:
+            size = os.path.getsize(source_path)
+            with self._lock:
+                if not path.exists():
+                    path.parent.mkdir(exist_ok=True)
+                    # Same filesystem as the upload temp dir, so this is a rename, not a copy
+                    os.replace(source_path, path)
+                self._conn.execute(
+                    "INSERT INTO blobs (sha256, size, refs) VALUES (?, ?, 1)"
+                    " ON CONFLICT(sha256) DO UPDATE SET refs = refs + 1",
+                    (sha256, size),
+                )
+                self._conn.commit()
+        finally:
+            if os.path.exists(source_path):
+                os.unlink(source_path)
+        return self.relative_path(sha256)
+
+    def release(self, relative_path: str) -> bool:
+        """Drops one reference; returns False if the path is not a blob."""
+        path = self._base_dir / relative_path
+        if path.parent.parent != self._blob_dir:
+            return False
+        sha256 = path.stem
+        with self._lock:
+            self._conn.execute("UPDATE blobs SET refs = refs - 1 WHERE sha256 = ?", (sha256,))
+            row = self._conn.execute("SELECT refs FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+            if row is None or row[0] <= 0:
+                self._conn.execute("DELETE FROM blobs WHERE sha256 = ?", (sha256,))
+                path.unlink(missing_ok=True)
+                self._derived_path(sha256).unlink(missing_ok=True)
+            self._conn.commit()
+        return True
+
+    def load_derived(self, sha256: str) -> Optional[dict]:
+        path = self._derived_path(sha256)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def save_derived(self, sha256: str, data: dict) -> None:
+        path = self._derived_path(sha256)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False))
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self._blob_dir / sha256[:2] / f"{sha256}.pdf"
+
+    def _derived_path(self, sha256: str) -> Path:
+        return self._derived_dir / f"{sha256}.json"
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from infrastructure.rag.retrieval_cache import normalize_query
+
+# Rough per-entry cost besides the vector and the text (dict slot, tuple, array header)
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+class QueryEmbeddingCache:
+    """Memory-bounded LRU of query vectors keyed by (provider, normalized text).
+
+    Vectors are kept as float32 numpy arrays. Concurrent requests for the
+    same key share one embedding call.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_embed(
+        self, model: str, text: str, embed: Callable[[str], Awaitable[List[float]]]
+    ) -> np.ndarray:
+        key = (model, normalize_query(text))
+        vector = self._get(key)
+        if vector is not None:
+            return vector
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            # The embedding runs as its own task: a caller that gets cancelled
+            # (client gone) must not cancel it for the others waiting on the key
+            inflight = asyncio.ensure_future(self._embed_and_store(key, text, embed))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(partial(self._forget, key))
+        return await asyncio.shield(inflight)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    async def _embed_and_store(
+        self, key: Tuple[str, str], text: str, embed: Callable[[str], Awaitable[List[float]]]
+    ) -> np.ndarray:
+        vector = np.asarray(await embed(text), dtype=np.float32)
+        self._put(key, vector)
+        return vector
+
+    def _forget(self, key: Tuple[str, str], task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Every waiter may have left; keep the loop from logging an unretrieved exception
+            task.exception()
+
+    def _get(self, key: Tuple[str, str]) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def _put(self, key: Tuple[str, str], vector: np.ndarray) -> None:
+        size = _entry_size(key, vector)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= _entry_size(key, previous)
+            self._entries[key] = vector
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                old_key, old_vector = self._entries.popitem(last=False)
+                self._bytes -= _entry_size(old_key, old_vector)
+
+
+def _entry_size(key: Tuple[str, str], vector: np.ndarray) -> int:
+    return vector.nbytes + len(key[0]) + len(key[1].encode("utf-8")) + _ENTRY_OVERHEAD_BYTES
@@ -0,0 +1,73 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    return _WHITESPACE.sub(" ", query).strip().lower()
+
+
+class RetrievalCache:
+    """In-process LRU + TTL cache of assembled RAG contexts.
+
+    Keys embed the current version of every collection searched, which is
+    bumped whenever its documents change; entries from older versions are
+    simply never looked up again and age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 600):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[float, str]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, collection_names: List[str], scope: Optional[str], k: int, query: str) -> Tuple:
+        names = tuple(collection_names)
+        return (names, self._versions_of(names), scope or "general", k, normalize_query(query))
+
+    def get(self, key: Tuple) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Tuple, context: str) -> None:
+        with self._lock:
+            # A bump between lookup and store makes this result stale already
+            if key[1] != self._versions_of(key[0]):
+                return
+            self._entries[key] = (time.monotonic() + self._ttl, context)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self, collection_name: str) -> None:
+        with self._lock:
+            self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
+
+    def _versions_of(self, collection_names: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._versions.get(name, 0) for name in collection_names)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
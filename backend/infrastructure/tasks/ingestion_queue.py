@@ -0,0 +1,50 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+
+
+class IngestionQueue:
+    """In-process job queue drained by a fixed number of worker tasks.
+
+    The handler is set once at wiring time; each queued item is passed to it
+    as-is. Failures are the handler's business — the worker just logs them
+    and moves on to the next item.
+    """
+
+    def __init__(self, workers: int = 2):
+        self._workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._handler: Optional[Callable[[object], Awaitable[None]]] = None
+
+    def set_handler(self, handler: Callable[[object], Awaitable[None]]) -> None:
+        self._handler = handler
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"ingestion-worker-{i}")
+            for i in range(self._workers)
+        ]
+
+    async def stop(self) -> None:
+        # Running jobs get CancelledError and are marked failed by their handler;
+        # jobs still waiting are picked up again on the next start from the job records
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def put(self, item: object) -> None:
+        if self._queue is None:
+            raise RuntimeError("IngestionQueue not started. Call start() during app startup.")
+        await self._queue.put(item)
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                await self._handler(item)
+            except Exception as e:
+                print(f"Erro na ingestão de documento: {e}")
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,33 @@
+import asyncio
+from typing import Awaitable, Set
+
+
+class TaskSupervisor:
+    """Runs work off the request path and keeps track of it.
+
+    Holding a reference to every task stops the event loop from garbage
+    collecting it mid-flight; failures are logged instead of vanishing, and
+    shutdown() gives in-flight work a chance to finish before cancelling it.
+    """
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+
+    def spawn(self, coro: Awaitable, name: str) -> asyncio.Task:
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_done)
+        return task
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"Erro na tarefa em segundo plano '{task.get_name()}': {task.exception()}")
@@ -4,7 +4,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
-from container import init_container
+from container import get_container, init_container
+from infrastructure.database.indexes import ensure_indexes
 from infrastructure.database.mongodb_client import connect, disconnect, get_database
 from presentation.api.routes import (
     auth_router,
@@ -20,7 +21,8 @@ async def lifespan(app: FastAPI):
     # Startup
     await connect(settings.mongodb_url)
     db = get_database(settings.database_name)
-    init_container(
+    await ensure_indexes(db)
+    container = init_container(
         db=db,
         openai_api_key=settings.openai_api_key,
         jwt_settings={
@@ -28,10 +30,38 @@ async def lifespan(app: FastAPI):
             "algorithm": settings.algorithm,
             "expire_minutes": settings.access_token_expire_minutes,
         },
+        rag_settings={
+            "max_workers": settings.rag_max_workers,
+            "extraction_workers": settings.pdf_extraction_workers,
+            "pages_per_batch": settings.pdf_pages_per_batch,
+            "embedding_cache_max_entries": settings.embedding_cache_max_entries,
+            "embedding_provider": settings.embedding_provider,
+            "embedding_model": settings.embedding_model,
+            "local_embedding_model": settings.local_embedding_model,
+            "embedding_batch_tokens": settings.embedding_batch_tokens,
+            "embedding_concurrency": settings.embedding_concurrency,
+            "lexical_shortcut_coverage": settings.rag_lexical_shortcut_coverage,
+            "context_max_tokens": settings.rag_context_max_tokens,
+            "min_similarity": settings.rag_min_similarity,
+            "mmr_lambda": settings.rag_mmr_lambda,
+            "result_cache_size": settings.rag_result_cache_size,
+            "result_cache_ttl_seconds": settings.rag_result_cache_ttl_seconds,
+            "query_embedding_cache_mb": settings.query_embedding_cache_mb,
+            "collection_layout": settings.rag_collection_layout,
+        },
+        ingestion_workers=settings.ingestion_workers,
+        max_upload_mb=settings.max_upload_mb,
     )
+    container.ingestion_queue.start()
+    requeued = await container.resume_ingestion_jobs_use_case.execute()
+    if requeued:
+        print(f"🔁 {requeued} processamento(s) de PDF retomado(s)")
     print(f"✅ Conectado ao MongoDB: {settings.database_name}")
     yield
     # Shutdown
+    await container.ingestion_queue.stop()
+    await container.task_supervisor.shutdown()
+    container.rag_gateway.close()
     await disconnect()
     print("❌ Conexão com MongoDB fechada")
 
@@ -49,6 +79,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth_router.router, prefix="/api/auth", tags=["Autenticação"])
@@ -68,6 +99,11 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    return get_container().rag_gateway.cache_stats()
+
+
 if __name__ == "__main__":
     import uvicorn
 
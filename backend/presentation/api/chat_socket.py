@@ -0,0 +1,124 @@
+import asyncio
+import json
+import time
+from typing import Optional
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+from application.dtos.chat_dtos import SendMessageInput
+from application.use_cases.chat.stream_message_use_case import StreamMessageUseCase
+from domain.entities.user import User
+from domain.exceptions.domain_exceptions import ConversationNotFoundError
+
+# Pending turns a client may queue while a reply is still streaming
+MAX_PENDING_TURNS = 4
+# Frames buffered for a slow client before the model stream is paused
+MAX_PENDING_FRAMES = 64
+
+
+class ChatSocketSession:
+    """One authenticated WebSocket carrying many chat turns.
+
+    Three tasks share the socket: a reader that queues incoming turns, a
+    worker that runs them one at a time, and a writer that drains a bounded
+    outbox. When the client reads slowly the outbox fills up and the worker
+    stops pulling tokens from the model until there is room again.
+
+    The socket is closed with 1008 once the handshake token expires, so a
+    long-lived connection cannot outlast its credentials.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user: User,
+        conversation_id: Optional[str],
+        use_case: StreamMessageUseCase,
+        expires_at: Optional[float] = None,
+    ):
+        self._ws = websocket
+        self._expires_at = expires_at
+        self._user = user
+        self._conversation_id = conversation_id
+        self._use_case = use_case
+        self._inbox: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_TURNS)
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_FRAMES)
+
+    async def run(self) -> None:
+        expiry = asyncio.create_task(self._wait_for_expiry())
+        tasks = {
+            asyncio.create_task(self._read_loop()),
+            asyncio.create_task(self._turn_loop()),
+            asyncio.create_task(self._write_loop()),
+            expiry,
+        }
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    print(f"WebSocket error: {task.exception()}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if expiry in done:
+            # Only after the writer has stopped, so the close frame does not race a send
+            await self._ws.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expirado")
+
+    async def _wait_for_expiry(self) -> None:
+        if self._expires_at is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(max(0.0, self._expires_at - time.time()))
+
+    async def _read_loop(self) -> None:
+        while True:
+            message = await self._ws.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            try:
+                payload = json.loads(message.get("text") or message.get("bytes") or "")
+            except ValueError:
+                await self._emit("error", {"detail": "Mensagem inválida: envie um objeto JSON"})
+                continue
+            content = payload.get("content") if isinstance(payload, dict) else None
+            if not content or not isinstance(content, str):
+                await self._emit("error", {"detail": "Campo 'content' é obrigatório"})
+                continue
+            try:
+                self._inbox.put_nowait(payload)
+            except asyncio.QueueFull:
+                await self._emit("error", {"detail": "Muitas mensagens pendentes. Aguarde a resposta atual."})
+
+    async def _turn_loop(self) -> None:
+        while True:
+            payload = await self._inbox.get()
+            events = self._use_case.execute(
+                SendMessageInput(
+                    content=payload["content"],
+                    user_id=self._user.id,
+                    conversation_id=self._conversation_id,
+                    copy_type=payload.get("copy_type") or "geral",
+                    brief=payload.get("brief"),
+                )
+            )
+            try:
+                async for item in events:
+                    if item.event == "start":
+                        self._conversation_id = item.data["conversation_id"]
+                    await self._emit(item.event, item.data)
+            except ConversationNotFoundError as e:
+                await self._emit("error", {"detail": str(e)})
+            except Exception as e:
+                print(f"Erro no WebSocket: {e}")
+                await self._emit("error", {"detail": "Erro ao gerar resposta. Tente novamente."})
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                frame = await self._outbox.get()
+                await self._ws.send_json(frame)
+        except WebSocketDisconnect:
+            pass
+
+    async def _emit(self, event: str, data: dict) -> None:
+        await self._outbox.put({"event": event, "data": data})
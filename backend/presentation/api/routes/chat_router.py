@@ -1,23 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
-from typing import Dict
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, status
+from fastapi.responses import StreamingResponse
 
 from application.dtos.chat_dtos import SendMessageInput
 from application.use_cases.chat.send_message_use_case import SendMessageUseCase
+from application.use_cases.chat.stream_message_use_case import StreamMessageUseCase
 from container import get_container
 from domain.entities.user import User
 from domain.exceptions.domain_exceptions import ConversationNotFoundError
+from presentation.api.chat_socket import ChatSocketSession
 from presentation.api.schemas.chat_schemas import MessageResponse, SendMessageRequest
-from presentation.dependencies import get_active_user
+from presentation.dependencies import authenticate_token, get_active_user
 
 router = APIRouter()
 
-_active_ws: Dict[str, WebSocket] = {}
-
 
 def _send_message_use_case() -> SendMessageUseCase:
     return get_container().send_message_use_case
 
 
+def _stream_message_use_case() -> StreamMessageUseCase:
+    return get_container().stream_message_use_case
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
 @router.get("/models")
 async def list_models(current_user: User = Depends(get_active_user)):
     return {
@@ -49,16 +60,59 @@ async def send_message(
     return MessageResponse(role=result.role, content=result.content, timestamp=result.timestamp)
 
 
+@router.post("/message/stream")
+async def stream_message(
+    body: SendMessageRequest,
+    current_user: User = Depends(get_active_user),
+    use_case: StreamMessageUseCase = Depends(_stream_message_use_case),
+):
+    events = use_case.execute(
+        SendMessageInput(
+            content=body.content,
+            user_id=current_user.id,
+            conversation_id=body.conversation_id,
+            copy_type=body.copy_type or "geral",
+            brief=body.brief,
+        )
+    )
+    # Pull the first event before answering so lookup errors still map to HTTP codes
+    try:
+        first = await anext(events)
+    except ConversationNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    async def event_stream() -> AsyncIterator[str]:
+        yield _sse(first.event, first.data)
+        try:
+            async for item in events:
+                yield _sse(item.event, item.data)
+        except Exception as e:
+            print(f"Erro no streaming: {e}")
+            yield _sse("error", {"detail": "Erro ao gerar resposta. Tente novamente."})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.websocket("/ws/{conversation_id}")
-async def websocket_endpoint(websocket: WebSocket, conversation_id: str):
+async def websocket_endpoint(websocket: WebSocket, conversation_id: str, token: Optional[str] = None):
+    # Browsers cannot set headers on the handshake, so the JWT travels as ?token=
+    user = await authenticate_token(token) if token else None
+    if not user or not user.is_active:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
     await websocket.accept()
-    try:
-        _active_ws[conversation_id] = websocket
-        while True:
-            await websocket.receive_json()
-            await websocket.send_json({"error": "WebSocket autenticado ainda não implementado"})
-    except WebSocketDisconnect:
-        _active_ws.pop(conversation_id, None)
-    except Exception as e:
-        print(f"WebSocket error: {e}")
-        _active_ws.pop(conversation_id, None)
+    container = get_container()
+    session = ChatSocketSession(
+        websocket,
+        user,
+        conversation_id=None if conversation_id == "new" else conversation_id,
+        use_case=container.stream_message_use_case,
+        # Already verified by authenticate_token; the session closes itself at expiry
+        expires_at=container.token_service.decode_token(token).get("exp"),
+    )
+    await session.run()
@@ -1,16 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import List, Optional
 
 from application.dtos.conversation_dtos import CreateConversationInput
 from application.use_cases.conversation.archive_conversation_use_case import ArchiveConversationUseCase
 from application.use_cases.conversation.create_conversation_use_case import CreateConversationUseCase
 from application.use_cases.conversation.delete_conversation_use_case import DeleteConversationUseCase
 from application.use_cases.conversation.get_conversation_use_case import GetConversationUseCase
-from application.use_cases.conversation.list_conversations_use_case import ListConversationsUseCase
+from application.use_cases.conversation.list_conversations_use_case import (
+    MAX_PAGE_SIZE,
+    ListConversationsUseCase,
+)
 from application.use_cases.conversation.update_brief_use_case import UpdateBriefUseCase
 from container import get_container
 from domain.entities.user import User
-from domain.exceptions.domain_exceptions import ConversationNotFoundError
+from domain.exceptions.domain_exceptions import ConversationNotFoundError, InvalidCursorError
 from presentation.api.schemas.chat_schemas import MessageResponse
 from presentation.api.schemas.conversation_schemas import (
     ConversationCreateRequest,
@@ -82,11 +85,21 @@ async def create_conversation(
 
 @router.get("", response_model=List[ConversationListResponse])
 async def list_conversations(
+    response: Response,
     include_archived: bool = False,
+    # Without limit and cursor the whole list is returned, as before pagination existed
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_active_user),
     use_case: ListConversationsUseCase = Depends(_list_uc),
 ):
-    items = await use_case.execute(current_user.id, include_archived)
+    try:
+        page = await use_case.execute(current_user.id, include_archived, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    # The body stays a plain list; the next page is requested with ?cursor=<X-Next-Cursor>
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
     return [
         ConversationListResponse(
             id=item.id,
@@ -95,8 +108,9 @@ async def list_conversations(
             created_at=item.created_at,
             updated_at=item.updated_at,
             message_count=item.message_count,
+            last_message_preview=item.last_message_preview,
         )
-        for item in items
+        for item in page.items
     ]
 
 
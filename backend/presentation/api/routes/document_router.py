@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from typing import List, Optional
 
 from application.use_cases.document.delete_document_use_case import DeleteDocumentUseCase
+from application.use_cases.document.get_ingestion_job_use_case import GetIngestionJobUseCase
 from application.use_cases.document.list_documents_use_case import ListDocumentsUseCase
 from application.use_cases.document.upload_document_use_case import UploadDocumentUseCase
 from container import get_container
 from domain.entities.user import User
-from domain.exceptions.domain_exceptions import DocumentNotFoundError
+from domain.exceptions.domain_exceptions import DocumentNotFoundError, IngestionJobNotFoundError
+from presentation.api.uploads import UPLOAD_REQUEST_BODY, spool_upload
 from presentation.dependencies import get_active_user
 
 router = APIRouter()
@@ -24,40 +28,41 @@ def _delete_uc() -> DeleteDocumentUseCase:
     return get_container().delete_document_use_case
 
 
-@router.post("/upload")
+def _job_uc() -> GetIngestionJobUseCase:
+    return get_container().get_ingestion_job_use_case
+
+
+@router.post("/upload", status_code=status.HTTP_202_ACCEPTED, openapi_extra=UPLOAD_REQUEST_BODY)
 async def upload_pdf(
-    file: UploadFile = File(...),
+    request: Request,
     conversation_id: Optional[str] = None,
     current_user: User = Depends(get_active_user),
     use_case: UploadDocumentUseCase = Depends(_upload_uc),
 ):
-    if file.content_type != "application/pdf":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Apenas arquivos PDF são suportados",
-        )
-    content = await file.read()
-    if len(content) > 10 * 1024 * 1024:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Arquivo muito grande. Tamanho máximo: 10MB",
-        )
+    container = get_container()
+    # The body is streamed to disk here, so the size limit applies while it is received
+    upload = await spool_upload(request, Path(container.upload_dir), container.max_upload_bytes)
+    # Processing happens in the background; poll GET /jobs/{job_id} for progress
+    return await use_case.execute(
+        pdf_path=upload.path,
+        filename=upload.filename,
+        file_size=upload.size,
+        content_hash=upload.sha256,
+        user_id=current_user.id,
+        conversation_id=conversation_id,
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_ingestion_job(
+    job_id: str,
+    current_user: User = Depends(get_active_user),
+    use_case: GetIngestionJobUseCase = Depends(_job_uc),
+):
     try:
-        result = await use_case.execute(
-            pdf_bytes=content,
-            filename=file.filename,
-            file_size=len(content),
-            user_id=current_user.id,
-            conversation_id=conversation_id,
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erro ao processar PDF: {e}",
-        )
-    return result
+        return await use_case.execute(job_id, current_user.id)
+    except IngestionJobNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
 @router.get("/list")
@@ -33,3 +33,4 @@ class ConversationListResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     message_count: int
+    last_message_preview: Optional[str] = None
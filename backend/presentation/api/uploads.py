@@ -0,0 +1,156 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import HTTPException, Request, status
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+# Room for the multipart boundaries and part headers around the file itself
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# OpenAPI description of the body parsed by spool_upload, since no File() parameter declares it
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    size: int
+    sha256: str
+    filename: str
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Arquivo muito grande. Tamanho máximo: {max_bytes // (1024 * 1024)}MB",
+    )
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class _FilePartReader:
+    """Collects the bytes of the multipart part named ``file`` as the body is fed in."""
+
+    def __init__(self, boundary: bytes):
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.found = False
+        self.pending: List[bytes] = []
+        self._in_file = False
+        self._headers: dict = {}
+        self._field = b""
+        self._value = b""
+        self._parser = MultipartParser(
+            boundary,
+            callbacks={
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            },
+        )
+
+    def feed(self, chunk: bytes) -> None:
+        self._parser.write(chunk)
+
+    def finish(self) -> None:
+        self._parser.finalize()
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._field.lower()] = self._value
+        self._field = b""
+        self._value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        # Only the first "file" part is read; anything else in the form is skipped
+        self._in_file = options.get(b"name") == b"file" and not self.found
+        if self._in_file:
+            self.found = True
+            self.filename = options.get(b"filename", b"").decode("utf-8", "replace")
+            self.content_type = self._headers.get(b"content-type", b"").decode("latin-1").strip()
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self.pending.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        self._in_file = False
+
+
+async def spool_upload(request: Request, dest_dir: Path, max_bytes: int) -> SpooledUpload:
+    """Streams the ``file`` field of a multipart request straight to a temp file, hashing as it goes.
+
+    The request body is parsed here rather than by Starlette, so nothing is
+    buffered or spooled elsewhere first. A declared Content-Length over the
+    limit is rejected before reading; otherwise reading stops as soon as the
+    file crosses it.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise _bad_request("Envie o PDF como multipart/form-data no campo 'file'")
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes + _MULTIPART_OVERHEAD_BYTES:
+        raise _too_large(max_bytes)
+
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=dest_dir, suffix=".upload")
+    reader = _FilePartReader(boundary)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            async for chunk in request.stream():
+                reader.feed(chunk)
+                if reader.found and reader.content_type != "application/pdf":
+                    raise _bad_request("Apenas arquivos PDF são suportados")
+                if not reader.pending:
+                    continue
+                data = b"".join(reader.pending)
+                reader.pending.clear()
+                size += len(data)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                hasher.update(data)
+                await run_in_threadpool(out.write, data)
+            reader.finish()
+        if not reader.found:
+            raise _bad_request("Nenhum arquivo enviado no campo 'file'")
+    except BaseException:
+        os.unlink(path)
+        raise
+    return SpooledUpload(path=path, size=size, sha256=hasher.hexdigest(), filename=reader.filename)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
@@ -8,26 +10,28 @@ from domain.entities.user import User
 _security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(_security),
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Não foi possível validar as credenciais",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+async def authenticate_token(token: str) -> Optional[User]:
     container = get_container()
     try:
-        payload = container.token_service.decode_token(credentials.credentials)
-        email: str = payload.get("sub")
-        if not email:
-            raise credentials_exception
+        payload = container.token_service.decode_token(token)
     except JWTError:
-        raise credentials_exception
+        return None
+    email: str = payload.get("sub")
+    if not email:
+        return None
+    return await container.user_repo.find_by_email(email)
 
-    user = await container.user_repo.find_by_email(email)
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(_security),
+) -> User:
+    user = await authenticate_token(credentials.credentials)
     if not user:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Não foi possível validar as credenciais",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
@@ -0,0 +1,60 @@
+"""
+Compares the MongoDB indexes with the ones declared by the repositories.
+
+Reports, per collection:
+- missing: declared in a repository's INDEXES but not present in the database
+- undeclared: present in the database but not declared by any repository
+- unused: no operations recorded by $indexStats since the server last started
+
+Run from the backend directory:
+    python -m scripts.check_indexes [--create]
+"""
+import argparse
+import sys
+
+from pymongo import MongoClient
+
+from config import settings
+from infrastructure.database.indexes import index_name, index_registry
+
+
+def check(create: bool) -> int:
+    db = MongoClient(settings.mongodb_url)[settings.database_name]
+    problems = 0
+
+    for collection, declared in index_registry().items():
+        existing = {index["name"] for index in db[collection].list_indexes()}
+        declared_names = {index_name(index) for index in declared}
+        usage = {
+            stats["name"]: stats["accesses"]
+            for stats in db[collection].aggregate([{"$indexStats": {}}])
+        }
+
+        print(f"{collection}:")
+        missing = [index for index in declared if index_name(index) not in existing]
+        for index in missing:
+            print(f"  ausente:       {index_name(index)}")
+        if missing and create:
+            db[collection].create_indexes(missing)
+            print(f"  {len(missing)} índice(s) criado(s)")
+
+        for name in sorted(existing - declared_names - {"_id_"}):
+            print(f"  não declarado: {name}")
+
+        for name in sorted(existing - {"_id_"}):
+            accesses = usage.get(name)
+            if accesses and accesses["ops"] == 0:
+                print(f"  sem uso:       {name} (desde {accesses['since']:%Y-%m-%d %H:%M})")
+
+        problems += 0 if create else len(missing)
+        problems += len(existing - declared_names - {"_id_"})
+
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--create", action="store_true", help="Create the missing indexes")
+    args = parser.parse_args()
+    # Non-zero exit when something is missing or undeclared, so it can gate a deploy
+    sys.exit(1 if check(args.create) else 0)
@@ -0,0 +1,118 @@
+"""
+Moves per-conversation Chroma collections into one collection per user.
+
+Old layout: ``user_{user_id}_{conversation_id|general}``
+New layout: ``user_{user_id}``, with ``conversation_id`` and ``document_id``
+stored on every vector and applied as filters at query time.
+
+Vectors are copied as-is (no re-embedding), Mongo ``documents`` records are
+repointed at the new collection, the BM25 index of every new collection is
+built from its chunks, and the RAG scope registry is reset so the API rebuilds
+it on the next start.
+
+Run from the backend directory (stop the API first):
+    python -m scripts.migrate_chroma_layout [--dry-run] [--keep-source]
+"""
+import argparse
+import re
+from pathlib import Path
+
+import chromadb
+from chromadb.config import Settings
+from pymongo import MongoClient
+
+from config import settings
+from infrastructure.rag.bm25_index import Bm25Index
+
+_LEGACY_NAME = re.compile(r"^user_(?P<user_id>[0-9a-f]{24})_(?P<scope>.+)$")
+_PAGE_SIZE = 500
+
+
+def _document_ids_by_path(db, collection_name: str) -> dict:
+    return {
+        doc["file_path"]: str(doc["_id"])
+        for doc in db.documents.find({"collection_name": collection_name}, {"file_path": 1})
+    }
+
+
+def migrate(storage_dir: Path, dry_run: bool, keep_source: bool) -> None:
+    client = chromadb.PersistentClient(
+        path=str(storage_dir / "chroma_db"),
+        settings=Settings(anonymized_telemetry=False, allow_reset=True),
+    )
+    db = MongoClient(settings.mongodb_url)[settings.database_name]
+    bm25 = Bm25Index(storage_dir / "bm25")
+    targets = set()
+
+    for source in client.list_collections():
+        match = _LEGACY_NAME.match(source.name)
+        if not match:
+            continue
+        target_name = f"user_{match['user_id']}"
+        conversation_id = match["scope"]
+        total = source.count()
+        print(f"{source.name} -> {target_name} ({total} vetores)")
+        if dry_run:
+            continue
+
+        document_ids = _document_ids_by_path(db, source.name)
+        target = client.get_or_create_collection(target_name, embedding_function=None)
+        targets.add(target_name)
+        for offset in range(0, total, _PAGE_SIZE):
+            page = source.get(
+                include=["embeddings", "documents", "metadatas"],
+                limit=_PAGE_SIZE,
+                offset=offset,
+            )
+            metadatas = []
+            for metadata in page["metadatas"]:
+                metadata = dict(metadata or {})
+                metadata.setdefault("conversation_id", conversation_id)
+                if "document_id" not in metadata and metadata.get("file_path") in document_ids:
+                    metadata["document_id"] = document_ids[metadata["file_path"]]
+                metadatas.append(metadata)
+            target.upsert(
+                ids=page["ids"],
+                embeddings=page["embeddings"],
+                documents=page["documents"],
+                metadatas=metadatas,
+            )
+
+        result = db.documents.update_many(
+            {"collection_name": source.name},
+            {"$set": {"collection_name": target_name}},
+        )
+        print(f"  {result.modified_count} documento(s) atualizados no MongoDB")
+        if not keep_source:
+            client.delete_collection(source.name)
+            bm25.remove_collection(source.name)
+
+    for target_name in sorted(targets):
+        # Chunks may come from several source collections; index the merged result
+        target = client.get_collection(target_name, embedding_function=None)
+        ids, texts, metadatas = [], [], []
+        for offset in range(0, target.count(), _PAGE_SIZE):
+            page = target.get(include=["documents", "metadatas"], limit=_PAGE_SIZE, offset=offset)
+            ids.extend(page["ids"])
+            texts.extend(page["documents"])
+            metadatas.extend(page["metadatas"])
+        bm25.rebuild(target_name, ids, texts, metadatas)
+        print(f"{target_name}: índice BM25 com {len(ids)} trecho(s)")
+
+    registry = storage_dir / "rag_scopes.json"
+    if not dry_run and registry.exists():
+        # Rebuilt from the collections on the next API start
+        registry.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be moved")
+    parser.add_argument("--keep-source", action="store_true", help="Do not delete the old collections")
+    parser.add_argument(
+        "--storage-dir",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "storage",
+    )
+    args = parser.parse_args()
+    migrate(args.storage_dir, args.dry_run, args.keep_source)
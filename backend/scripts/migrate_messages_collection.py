@@ -0,0 +1,73 @@
+"""
+Moves the ``messages`` array of every conversation into the ``messages`` collection.
+
+Old layout: ``conversations.messages = [{role, content, token_count, timestamp}, ...]``
+New layout: one document per message in ``messages`` with ``conversation_id`` and
+``user_id``, indexed by ``(conversation_id, timestamp, _id)``; the conversation only
+keeps ``message_count`` and ``last_message_preview``.
+
+Each conversation is handled on its own and can be re-run safely: its
+messages are replaced, then the array is removed from the conversation.
+
+Run from the backend directory (stop the API first):
+    python -m scripts.migrate_messages_collection [--dry-run]
+"""
+import argparse
+from datetime import datetime
+
+from pymongo import ASCENDING, MongoClient
+
+from config import settings
+
+
+def migrate(dry_run: bool) -> None:
+    db = MongoClient(settings.mongodb_url)[settings.database_name]
+    if not dry_run:
+        db.messages.create_index([("conversation_id", ASCENDING), ("timestamp", ASCENDING), ("_id", ASCENDING)])
+
+    moved = 0
+    pending = db.conversations.find({"messages": {"$exists": True}}, {"user_id": 1, "messages": 1})
+    for conversation in pending:
+        conversation_id = str(conversation["_id"])
+        messages = conversation.get("messages") or []
+        print(f"{conversation_id}: {len(messages)} mensagem(ns)")
+        if dry_run:
+            continue
+
+        # A previous interrupted run may have copied part of this conversation already
+        db.messages.delete_many({"conversation_id": conversation_id})
+        if messages:
+            db.messages.insert_many(
+                [
+                    {
+                        "conversation_id": conversation_id,
+                        "user_id": conversation["user_id"],
+                        "role": m["role"],
+                        "content": m["content"],
+                        "token_count": m.get("token_count", 0),
+                        "timestamp": m.get("timestamp") or datetime.utcnow(),
+                    }
+                    for m in messages
+                ],
+                ordered=True,
+            )
+        db.conversations.update_one(
+            {"_id": conversation["_id"]},
+            {
+                "$set": {
+                    "message_count": len(messages),
+                    "last_message_preview": messages[-1]["content"][:120] if messages else None,
+                },
+                "$unset": {"messages": ""},
+            },
+        )
+        moved += len(messages)
+
+    print(f"{moved} mensagem(ns) movidas")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be moved")
+    args = parser.parse_args()
+    migrate(args.dry_run)